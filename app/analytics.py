@@ -1,20 +1,70 @@
 import time
 import requests
 import threading
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
 from .config import MEDIAMTX_API_PORT
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# A path that has received no bytes for this many seconds is reported stale
+STALE_AFTER_SECONDS = 10
+
+# Upper bound for the idle backoff multiplier applied to poll_interval
+MAX_IDLE_MULTIPLIER = 8
+# Longest idle wait between polls. Kept below STALE_AFTER_SECONDS so a new
+# reader or stream still shows up before a path could be flagged stale.
+MAX_IDLE_POLL_SECONDS = 8
+
+# bytes -> kilobits, for the per-path bitrate calculation
+_KBITS_PER_BYTE = 8 / 1024
+
+# Returned for paths MediaMTX doesn't know about. Shared, so never mutate it.
+_EMPTY_STREAM_STATS = {
+    'online': False,
+    'ready': False,  # Backwards-compat alias
+    'bitrate': 0,
+    'readers': 0,
+    'reader_ips': (),
+    'tracks': ()
+}
+
+def _parse_json(response):
+    """Decode a MediaMTX API response, using orjson when it is installed"""
+    if _HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
 class AnalyticsManager:
     """Polls MediaMTX API for real-time stream analytics"""
     
     def __init__(self, poll_interval=3):
         self.poll_interval = poll_interval
         self.data = {}
+        # Read-only view of self.data handed out by get_analytics()
+        self._data_view = MappingProxyType(self.data)
         self.last_poll_time = 0
         self.running = False
         self.thread = None
-        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # Grows while nothing changes between polls, reset on any activity
+        self._idle_multiplier = 1
+        self._last_digest = None
+
+        api_base = f"http://127.0.0.1:{MEDIAMTX_API_PORT}/v3"
+        self._url = f"{api_base}/paths/list"
+        self._rtsp_sessions_url = f"{api_base}/rtspsessions/list"
+        self._webrtc_sessions_url = f"{api_base}/webrtcsessions/list"
+
+        # Reuse one keep-alive connection to the MediaMTX API across polls
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
         
-        # History for bitrate calculation
+        # History for bitrate calculation (times are time.monotonic())
         # { path_name: { 'bytesReceived': val, 'time': val } }
         self._history = {}
 
@@ -23,6 +73,7 @@ class AnalyticsManager:
         if self.running:
             return
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
         print(f"Analytics thread started (Interval: {self.poll_interval}s)")
@@ -30,35 +81,45 @@ class AnalyticsManager:
     def stop(self):
         """Stop the background polling thread"""
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=1)
 
     def _run(self):
         """Main polling loop"""
-        while self.running:
-            try:
-                self._poll()
-            except Exception as e:
-                # Silently ignore errors if MediaMTX is restarting/down
-                pass
-            time.sleep(self.poll_interval)
+        try:
+            while self.running:
+                try:
+                    self._poll()
+                except Exception as e:
+                    # Silently ignore errors if MediaMTX is restarting/down
+                    pass
+                # Wait on the stop event rather than sleeping so stop() wakes us immediately
+                delay = min(self.poll_interval * self._idle_multiplier,
+                            max(self.poll_interval, MAX_IDLE_POLL_SECONDS))
+                if self._stop_event.wait(delay):
+                    break
+        finally:
+            # Closed here rather than in stop(): stop() only waits briefly and
+            # a poll may still be using the session when it returns
+            self._session.close()
 
     def _poll(self):
         """Poll MediaMTX for path statistics"""
-        url = f"http://127.0.0.1:{MEDIAMTX_API_PORT}/v3/paths/list"
-        response = requests.get(url, timeout=2)
+        response = self._session.get(self._url, timeout=2)
         if response.status_code != 200:
             return
 
-        json_data = response.json()
-        current_time = time.time()
+        json_data = _parse_json(response)
+        # Monotonic clock for deltas so NTP/wall-clock jumps can't skew bitrates
+        current_time = time.monotonic()
         
         # Fetch active RTSP and WebRTC sessions to map ID -> IP address
         session_ips = {}
         try:
-            rtsp_resp = requests.get(f"http://127.0.0.1:{MEDIAMTX_API_PORT}/v3/rtspsessions/list", timeout=2)
+            rtsp_resp = self._session.get(self._rtsp_sessions_url, timeout=2)
             if rtsp_resp.status_code == 200:
-                for item in rtsp_resp.json().get('items', []):
+                for item in _parse_json(rtsp_resp).get('items', []):
                     s_id = item.get('id')
                     r_addr = item.get('remoteAddr')
                     if s_id and r_addr:
@@ -67,9 +128,9 @@ class AnalyticsManager:
             pass
 
         try:
-            webrtc_resp = requests.get(f"http://127.0.0.1:{MEDIAMTX_API_PORT}/v3/webrtcsessions/list", timeout=2)
+            webrtc_resp = self._session.get(self._webrtc_sessions_url, timeout=2)
             if webrtc_resp.status_code == 200:
-                for item in webrtc_resp.json().get('items', []):
+                for item in _parse_json(webrtc_resp).get('items', []):
                     s_id = item.get('id')
                     r_addr = item.get('remoteAddr')
                     if s_id and r_addr:
@@ -78,7 +139,7 @@ class AnalyticsManager:
             pass
         
         new_analytics = {}
-        items = json_data.get('items', [])
+        items = json_data.get('items') or ()
         
         for item in items:
             name = item.get('name')
@@ -89,7 +150,8 @@ class AnalyticsManager:
             # Keep 'ready' fallback for any older binary still present during upgrade
             is_online = item.get('online', item.get('ready', False))
             # v1.17 - readers renamed to outboundSessions
-            sessions = item.get('outboundSessions') or item.get('readers') or []
+            # (shared empty tuple avoids allocating a list per path on every poll)
+            sessions = item.get('outboundSessions') or item.get('readers') or ()
             reader_ips = []
             for s in sessions:
                 if isinstance(s, dict):
@@ -106,34 +168,42 @@ class AnalyticsManager:
                             ip = remote_addr.split(':')[0]
                         reader_ips.append(ip)
 
+            source = item.get('source')
+            if isinstance(source, dict):
+                source_type = source.get('type', 'unknown')
+                # v1.17 moved bytesReceived/Sent into source object
+                bytes_received = item.get('bytesReceived') or source.get('bytesReceived', 0)
+                bytes_sent = item.get('bytesSent') or source.get('bytesSent', 0)
+            else:
+                source_type = 'unknown'
+                bytes_received = item.get('bytesReceived', 0)
+                bytes_sent = item.get('bytesSent', 0)
+
             analytics = {
                 'online': is_online,
                 'ready': is_online,  # Backwards-compat alias
-                'tracks': item.get('tracks', []),
+                'tracks': item.get('tracks') or (),
                 'readers': len(sessions),
                 'reader_ips': reader_ips,
-                'source': item.get('source', {}).get('type', 'unknown') if isinstance(item.get('source'), dict) else 'unknown',
-                # v1.17 moved bytesReceived/Sent into source object
-                'bytesReceived': item.get('bytesReceived') or item.get('source', {}).get('bytesReceived', 0) if isinstance(item.get('source'), dict) else item.get('bytesReceived', 0),
-                'bytesSent': item.get('bytesSent') or item.get('source', {}).get('bytesSent', 0) if isinstance(item.get('source'), dict) else item.get('bytesSent', 0),
+                'source': source_type,
+                'bytesReceived': bytes_received,
+                'bytesSent': bytes_sent,
                 'bitrate': 0  # To be calculated
             }
             
             # Bitrate and Health tracking
             if name in self._history:
                 last_data = self._history[name]
-                delta_bytes = analytics['bytesReceived'] - last_data['bytesReceived']
+                # Clamp at zero: a counter reset (MediaMTX restart) counts as no data
+                delta_bytes = max(0, analytics['bytesReceived'] - last_data['bytesReceived'])
                 delta_time = current_time - last_data['time']
                 
                 # Update last_recv_time if bytes increased
-                if delta_bytes > 0:
-                    analytics['last_recv_time'] = current_time
-                else:
-                    analytics['last_recv_time'] = last_data.get('last_recv_time', current_time)
+                analytics['last_recv_time'] = current_time if delta_bytes else last_data.get('last_recv_time', current_time)
 
-                if delta_time > 0 and delta_bytes >= 0:
+                if delta_time > 0:
                     # (bytes * 8) / (1024 * seconds) = kbps
-                    analytics['bitrate'] = round((delta_bytes * 8) / (1024 * delta_time), 1)
+                    analytics['bitrate'] = round(delta_bytes * _KBITS_PER_BYTE / delta_time, 1)
             else:
                 analytics['last_recv_time'] = current_time
             
@@ -144,28 +214,43 @@ class AnalyticsManager:
                 'last_recv_time': analytics['last_recv_time']
             }
             
-            # Health check: if no bytes for 10 seconds, it's 'stale'
-            analytics['stale'] = (current_time - analytics['last_recv_time']) > 10
+            # Health check: if no bytes for STALE_AFTER_SECONDS, it's 'stale'
+            analytics['stale'] = (current_time - analytics['last_recv_time']) > STALE_AFTER_SECONDS
             
             new_analytics[name] = analytics
+
+        # Drop history for paths MediaMTX no longer reports so it can't grow forever
+        for old_name in [n for n in self._history if n not in new_analytics]:
+            del self._history[old_name]
+
+        # Back off while idle: nothing received and no viewer changes on any path
+        digest = tuple(
+            (name, a['bytesReceived'], a['online'], a['readers'])
+            for name, a in new_analytics.items()
+        )
+        if digest == self._last_digest:
+            self._idle_multiplier = min(MAX_IDLE_MULTIPLIER, self._idle_multiplier * 2)
+        else:
+            self._idle_multiplier = 1
+        self._last_digest = digest
             
-        with self._lock:
-            self.data = new_analytics
-            self.last_poll_time = current_time
+        # Publish without a lock: readers only ever take a reference to the
+        # current snapshot and attribute assignment is atomic under the GIL.
+        # Data goes first so a racing reader never pairs a fresh timestamp
+        # with stale data.
+        self.data = new_analytics
+        self._data_view = MappingProxyType(new_analytics)
+        self.last_poll_time = time.time()  # Wall clock, for display
 
     def get_analytics(self):
-        """Get the latest collected analytics data"""
-        with self._lock:
-            return self.data.copy()
+        """Get the latest collected analytics data.
+
+        _poll publishes a fresh dict on every cycle and never mutates it
+        afterwards, so callers get an O(1) read-only view of the current
+        snapshot rather than a copy. Use dict() on it if a real dict is needed.
+        """
+        return self._data_view
 
     def get_stream_stats(self, path_name):
         """Get stats for a specific stream path"""
-        with self._lock:
-            return self.data.get(path_name, {
-                'online': False,
-                'ready': False,  # Backwards-compat alias
-                'bitrate': 0,
-                'readers': 0,
-                'reader_ips': [],
-                'tracks': []
-            })
+        return self.data.get(path_name, _EMPTY_STREAM_STATS)
@@ -2,15 +2,17 @@
 import threading
 import socket
 import time
-import uuid
+import uuid as uuid_mod
 import hashlib
+import functools
+import operator
 import queue
 import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime
 import os
 from concurrent.futures import ThreadPoolExecutor
-from werkzeug.serving import make_server, ThreadedWSGIServer
+from werkzeug.serving import ThreadedWSGIServer
 from .config import (
     MEDIAMTX_PORT, AI_DEFAULT_MODEL, AI_CONFIDENCE_THRESHOLD, AI_MOTION_SENSITIVITY, 
     GRABBER_RECONNECT_BASE, GRABBER_RECONNECT_MAX, WSGI_MAX_WORKERS,
@@ -141,13 +143,177 @@ class RTSPFrameGrabber:
             self.cap = None
 
 
+# Marks a uuid/nic_mac that has never been assigned, so even None is stored
+_UNSET = object()
+
+
+# (json key, attribute) pairs serialized by to_dict() / to_config_dict(), in
+# the order the keys are written. Resolved once into attrgetters so
+# serialization is a single C-level call per camera instead of one attribute
+# load per key. An attribute of None marks a key to_dict() computes itself.
+_API_DICT_FIELDS = (
+    ('id', 'id'),
+    ('uuid', 'uuid'),
+    ('name', 'name'),
+    ('host', None),
+    ('mainStreamUrl', 'main_stream_url'),
+    ('subStreamUrl', 'sub_stream_url'),
+    ('rtspPort', 'rtsp_port'),
+    ('onvifPort', 'onvif_port'),
+    ('pathName', 'path_name'),
+    ('username', 'username'),
+    ('password', 'password'),
+    ('autoStart', 'auto_start'),
+    ('status', 'status'),
+    ('mainWidth', 'main_width'),
+    ('mainHeight', 'main_height'),
+    ('subWidth', '_sub_width'),
+    ('subHeight', '_sub_height'),
+    ('mainFramerate', 'main_framerate'),
+    ('subFramerate', '_sub_framerate'),
+    ('onvifUsername', 'onvif_username'),
+    ('onvifPassword', 'onvif_password'),
+    ('transcodeSub', 'transcode_sub'),
+    ('transcodeMain', 'transcode_main'),
+    ('disableSubstream', 'disable_substream'),
+    ('useMainAsSubstream', 'use_main_as_substream'),
+    ('enableAudio', 'enable_audio'),
+    ('transcodeMainAudio', 'transcode_main_audio'),
+    ('transcodeSubAudio', 'transcode_sub_audio'),
+    ('audioEncodingMain', 'audio_encoding_main'),
+    ('audioSampleRateMain', 'audio_sample_rate_main'),
+    ('audioBitrateMain', 'audio_bitrate_main'),
+    ('audioEncodingSub', 'audio_encoding_sub'),
+    ('audioSampleRateSub', 'audio_sample_rate_sub'),
+    ('audioBitrateSub', 'audio_bitrate_sub'),
+    ('useVirtualNic', 'use_virtual_nic'),
+    ('parentInterface', 'parent_interface'),
+    ('nicMac', 'nic_mac'),
+    ('ipMode', 'ip_mode'),
+    ('staticIp', 'static_ip'),
+    ('netmask', 'netmask'),
+    ('gateway', 'gateway'),
+    ('assignedIp', 'assigned_ip'),
+    ('macAddress', 'mac_address'),
+    ('debugMode', 'debug_mode'),
+    ('enableEventForwarding', 'enable_event_forwarding'),
+    ('physicalOnvifPort', 'physical_onvif_port'),
+    ('onvifForwardingUsername', 'onvif_forwarding_username'),
+    ('onvifForwardingPassword', 'onvif_forwarding_password'),
+    ('eventSource', 'event_source'),
+    ('aiTargets', 'ai_targets'),
+    ('aiModel', 'ai_model'),
+    ('aiMotionDetectionEnabled', 'ai_motion_detection_enabled'),
+    ('aiMotionSensitivity', 'ai_motion_sensitivity'),
+    ('aiConfidenceThreshold', 'ai_confidence_threshold'),
+    ('aiZone', 'ai_zone'),
+    ('aiZoneProfiles', 'ai_zone_profiles'),
+    ('aiActiveZoneProfile', 'ai_active_zone_profile'),
+    ('sendSmartOnvifTopics', 'send_smart_onvif_topics'),
+    ('notifyAiEnabled', 'notify_ai_enabled'),
+    ('notifyAiCooldown', 'notify_ai_cooldown'),
+    ('notifyAiTargets', 'notify_ai_targets'),
+    ('notifyAiAttachImage', 'notify_ai_attach_image'),
+    ('notifyAiLicensePlates', 'notify_ai_license_plates'),
+    ('notifyAiZoneFilter', 'notify_ai_zone_filter'),
+    ('notifyAiSchedules', 'notify_ai_schedules'),
+    ('notifyScheduleEnabled', 'notify_schedule_enabled'),
+    ('notifyScheduleDays', 'notify_schedule_days'),
+    ('notifyScheduleStart', 'notify_schedule_start'),
+    ('notifyScheduleEnd', 'notify_schedule_end'),
+    ('onvifSubscriptionActive', 'onvif_subscription_active'),
+    ('onvifSubscriptionError', 'onvif_subscription_error'),
+    ('onvifActiveSubscriptions', None),
+    ('onvifSubscribersIPs', None),
+    ('aiInferenceCount', 'ai_inference_count'),
+    ('aiDetectionCount', 'ai_detection_count'),
+    ('aiLastInferenceTime', 'ai_last_inference_time'),
+    ('aiLastInferenceLatency', 'ai_last_inference_latency'),
+    ('aiAvgInferenceLatency', 'ai_avg_inference_latency'),
+    ('aiQueueTime', 'ai_queue_time'),
+    ('aiFpsMeasurement', 'ai_fps_measurement'),
+    ('aiLastDetection', 'ai_last_detection'),
+    ('streamProbe', 'stream_probe'),
+)
+
+_CONFIG_DICT_FIELDS = (
+    ('id', 'id'),
+    ('uuid', 'uuid'),
+    ('name', 'name'),
+    ('mainStreamUrl', 'main_stream_url'),
+    ('subStreamUrl', 'sub_stream_url'),
+    ('rtspPort', 'rtsp_port'),
+    ('onvifPort', 'onvif_port'),
+    ('pathName', 'path_name'),
+    ('username', 'username'),
+    ('password', 'password'),
+    ('autoStart', 'auto_start'),
+    # NOTE: status is NOT saved - it's runtime only
+    # This ensures autoStart setting is respected on server restart
+    ('mainWidth', 'main_width'),
+    ('mainHeight', 'main_height'),
+    ('subWidth', '_sub_width'),
+    ('subHeight', '_sub_height'),
+    ('mainFramerate', 'main_framerate'),
+    ('subFramerate', '_sub_framerate'),
+    ('onvifUsername', 'onvif_username'),
+    ('onvifPassword', 'onvif_password'),
+    ('transcodeSub', 'transcode_sub'),
+    ('transcodeMain', 'transcode_main'),
+    ('disableSubstream', 'disable_substream'),
+    ('useMainAsSubstream', 'use_main_as_substream'),
+    ('enableAudio', 'enable_audio'),
+    ('transcodeMainAudio', 'transcode_main_audio'),
+    ('transcodeSubAudio', 'transcode_sub_audio'),
+    ('useVirtualNic', 'use_virtual_nic'),
+    ('parentInterface', 'parent_interface'),
+    ('nicMac', 'nic_mac'),
+    ('ipMode', 'ip_mode'),
+    ('staticIp', 'static_ip'),
+    ('netmask', 'netmask'),
+    ('gateway', 'gateway'),
+    ('debugMode', 'debug_mode'),
+    ('enableEventForwarding', 'enable_event_forwarding'),
+    ('physicalOnvifPort', 'physical_onvif_port'),
+    ('onvifForwardingUsername', 'onvif_forwarding_username'),
+    ('onvifForwardingPassword', 'onvif_forwarding_password'),
+    ('eventSource', 'event_source'),
+    ('aiTargets', 'ai_targets'),
+    ('aiModel', 'ai_model'),
+    ('aiMotionDetectionEnabled', 'ai_motion_detection_enabled'),
+    ('aiMotionSensitivity', 'ai_motion_sensitivity'),
+    ('aiConfidenceThreshold', 'ai_confidence_threshold'),
+    ('aiZone', 'ai_zone'),
+    ('aiZoneProfiles', 'ai_zone_profiles'),
+    ('aiActiveZoneProfile', 'ai_active_zone_profile'),
+    ('sendSmartOnvifTopics', 'send_smart_onvif_topics'),
+    ('notifyAiEnabled', 'notify_ai_enabled'),
+    ('notifyAiCooldown', 'notify_ai_cooldown'),
+    ('notifyAiTargets', 'notify_ai_targets'),
+    ('notifyAiAttachImage', 'notify_ai_attach_image'),
+    ('notifyAiLicensePlates', 'notify_ai_license_plates'),
+    ('notifyAiZoneFilter', 'notify_ai_zone_filter'),
+    ('notifyAiSchedules', 'notify_ai_schedules'),
+    ('notifyScheduleEnabled', 'notify_schedule_enabled'),
+    ('notifyScheduleDays', 'notify_schedule_days'),
+    ('notifyScheduleStart', 'notify_schedule_start'),
+    ('notifyScheduleEnd', 'notify_schedule_end'),
+)
+
+_API_DICT_KEYS = tuple(key for key, _ in _API_DICT_FIELDS)
+_API_DICT_ATTR_KEYS = tuple(key for key, attr in _API_DICT_FIELDS if attr)
+_api_dict_getter = operator.attrgetter(*(attr for _, attr in _API_DICT_FIELDS if attr))
+_CONFIG_DICT_KEYS = tuple(key for key, _ in _CONFIG_DICT_FIELDS)
+_config_dict_getter = operator.attrgetter(*(attr for _, attr in _CONFIG_DICT_FIELDS))
+
+
 class VirtualONVIFCamera:
     """Represents a virtual ONVIF camera"""
     
     def __init__(self, config, manager=None):
         self.manager = manager
         self.id = config['id']
-        self.uuid = config.get('uuid') or str(uuid.uuid4())
+        self.uuid = config.get('uuid') or str(uuid_mod.uuid4())
         self.name = config['name']
         self.main_stream_url = config['mainStreamUrl']
         self.sub_stream_url = config['subStreamUrl']
@@ -271,19 +437,50 @@ class VirtualONVIFCamera:
         self.onvif_subscription_active = False
         self.onvif_subscription_error = None
 
-    @property
+    @functools.cached_property
     def mac_address(self):
-        """Get the MAC address for this camera (Virtual NIC or generated)"""
+        """Get the MAC address for this camera (Virtual NIC or generated)
+
+        Cached after the first lookup; the uuid and nic_mac setters drop the
+        cached value so it is recomputed when either input changes.
+        """
         if self.nic_mac and ':' in self.nic_mac:
             return self.nic_mac.lower()
         
         # Generate a stable MAC based on camera UUID if none provided
-        # Use hashlib to get a deterministic hash from the UUID
+        # Use hashlib to get a deterministic hash from the UUID.
+        # Keep MD5 here: NVRs key adopted cameras on this MAC (and the serial
+        # derived from it), so switching hash functions would re-identify every
+        # existing camera. It only runs once per camera now that it's cached.
         h = hashlib.md5(self.uuid.encode()).hexdigest()
         # Take the first 10 characters for the MAC suffix (5 bytes)
         # Prefix with 02 to indicate locally administered
         mac = f"02:{h[0:2]}:{h[2:4]}:{h[4:6]}:{h[6:8]}:{h[8:10]}"
         return mac.lower()
+
+    def clear_mac_cache(self):
+        """Forget the cached mac_address so the next access recomputes it"""
+        self.__dict__.pop('mac_address', None)
+
+    @property
+    def uuid(self):
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, value):
+        if value != self.__dict__.get('_uuid', _UNSET):
+            self._uuid = value
+            self.clear_mac_cache()
+
+    @property
+    def nic_mac(self):
+        return self._nic_mac
+
+    @nic_mac.setter
+    def nic_mac(self, value):
+        if value != self.__dict__.get('_nic_mac', _UNSET):
+            self._nic_mac = value
+            self.clear_mac_cache()
         
     def get_effective_ip(self):
         """Determine the IP address that should be reported for this camera"""
@@ -394,7 +591,10 @@ class VirtualONVIFCamera:
             print(f"  [Stream Check] Probe failed for {self.name}: {e}")
 
     def stop(self):
-        """Mark camera as stopped, shutdown ONVIF service, and cleanup networking"""
+        """Mark camera as stopped, shutdown ONVIF service, and cleanup networking
+
+        Returns False if the Virtual NIC could not be removed.
+        """
         self.status = "stopped"
         if self.enable_event_forwarding:
             self.stop_event_forwarding()
@@ -422,8 +622,10 @@ class VirtualONVIFCamera:
         if self.use_virtual_nic and self.network_mgr:
             self._stop_keepalive()
             vnic_name = f"vnic_{self.uuid.replace('-', '')[:10]}"
-            self.network_mgr.remove_interface(vnic_name)
+            removed = self.network_mgr.remove_interface(vnic_name)
             self.assigned_ip = None
+            return removed
+        return True
         
     def _start_onvif_service(self):
         """Start the ONVIF web service"""
@@ -443,15 +645,12 @@ class VirtualONVIFCamera:
         server = None
         for attempt in range(10):
             try:
-                server = make_server(
+                server = ThreadPoolWSGIServer(
                     bind_ip,
                     self.onvif_port,
                     app,
-                    threaded=False,  # Disable default threading
-                    request_handler=None,
-                    passthrough_errors=False,
-                    ssl_context=None,
-                    fd=None
+                    max_workers=WSGI_MAX_WORKERS,
+                    passthrough_errors=False
                 )
                 break
             except OSError as e:
@@ -461,11 +660,6 @@ class VirtualONVIFCamera:
                 else:
                     raise e
         
-        # Replace the server class with our thread-pooled version
-        server.__class__ = ThreadPoolWSGIServer
-        server.executor = ThreadPoolExecutor(max_workers=WSGI_MAX_WORKERS)
-        server.max_workers = WSGI_MAX_WORKERS
-        
         self.server = server
         
         # Run server in a separate thread
@@ -517,156 +711,22 @@ class VirtualONVIFCamera:
 
     def to_dict(self):
         """Convert to dictionary for API"""
-        return {
-            'id': self.id,
-            'uuid': self.uuid,
-            'name': self.name,
-            'host': self.get_effective_ip(),
-            'mainStreamUrl': self.main_stream_url,
-            'subStreamUrl': self.sub_stream_url,
-            'rtspPort': self.rtsp_port,
-            'onvifPort': self.onvif_port,
-            'pathName': self.path_name,
-            'username': self.username,
-            'password': self.password,
-            'autoStart': self.auto_start,
-            'status': self.status,
-            'mainWidth': self.main_width,
-            'mainHeight': self.main_height,
-            'subWidth': self._sub_width,
-            'subHeight': self._sub_height,
-            'mainFramerate': self.main_framerate,
-            'subFramerate': self._sub_framerate,
-            'onvifUsername': self.onvif_username,
-            'onvifPassword': self.onvif_password,
-            'transcodeSub': self.transcode_sub,
-            'transcodeMain': self.transcode_main,
-            'disableSubstream': self.disable_substream,
-            'useMainAsSubstream': self.use_main_as_substream,
-            'enableAudio': self.enable_audio,
-            'transcodeMainAudio': self.transcode_main_audio,
-            'transcodeSubAudio': self.transcode_sub_audio,
-            'audioEncodingMain': self.audio_encoding_main,
-            'audioSampleRateMain': self.audio_sample_rate_main,
-            'audioBitrateMain': self.audio_bitrate_main,
-            'audioEncodingSub': self.audio_encoding_sub,
-            'audioSampleRateSub': self.audio_sample_rate_sub,
-            'audioBitrateSub': self.audio_bitrate_sub,
-            'useVirtualNic': self.use_virtual_nic,
-            'parentInterface': self.parent_interface,
-            'nicMac': self.nic_mac,
-            'ipMode': self.ip_mode,
-            'staticIp': self.static_ip,
-            'netmask': self.netmask,
-            'gateway': self.gateway,
-            'assignedIp': self.assigned_ip,
-            'macAddress': self.mac_address,
-            'debugMode': self.debug_mode,
-            'enableEventForwarding': self.enable_event_forwarding,
-            'physicalOnvifPort': self.physical_onvif_port,
-            'onvifForwardingUsername': self.onvif_forwarding_username,
-            'onvifForwardingPassword': self.onvif_forwarding_password,
-            'eventSource': self.event_source,
-            'aiTargets': self.ai_targets,
-            'aiModel': self.ai_model,
-            'aiMotionDetectionEnabled': self.ai_motion_detection_enabled,
-            'aiMotionSensitivity': self.ai_motion_sensitivity,
-            'aiConfidenceThreshold': self.ai_confidence_threshold,
-            'aiZone': self.ai_zone,
-            'aiZoneProfiles': self.ai_zone_profiles,
-            'aiActiveZoneProfile': self.ai_active_zone_profile,
-            'sendSmartOnvifTopics': self.send_smart_onvif_topics,
-            'notifyAiEnabled': self.notify_ai_enabled,
-            'notifyAiCooldown': self.notify_ai_cooldown,
-            'notifyAiTargets': self.notify_ai_targets,
-            'notifyAiAttachImage': self.notify_ai_attach_image,
-            'notifyAiLicensePlates': self.notify_ai_license_plates,
-            'notifyAiZoneFilter': self.notify_ai_zone_filter,
-            'notifyAiSchedules': self.notify_ai_schedules,
-            'notifyScheduleEnabled': self.notify_schedule_enabled,
-            'notifyScheduleDays': self.notify_schedule_days,
-            'notifyScheduleStart': self.notify_schedule_start,
-            'notifyScheduleEnd': self.notify_schedule_end,
-            'onvifSubscriptionActive': self.onvif_subscription_active,
-            'onvifSubscriptionError': self.onvif_subscription_error,
-            'onvifActiveSubscriptions': len(self.onvif_service.subscriptions) if self.onvif_service else 0,
-            'onvifSubscribersIPs': [sub.client_ip for sub in self.onvif_service.subscriptions.values() if sub.client_ip] if self.onvif_service else [],
-            'aiInferenceCount': self.ai_inference_count,
-            'aiDetectionCount': self.ai_detection_count,
-            'aiLastInferenceTime': self.ai_last_inference_time,
-            'aiLastInferenceLatency': self.ai_last_inference_latency,
-            'aiAvgInferenceLatency': self.ai_avg_inference_latency,
-            'aiQueueTime': self.ai_queue_time,
-            'aiFpsMeasurement': self.ai_fps_measurement,
-            'aiLastDetection': self.ai_last_detection,
-            'streamProbe': self.stream_probe
-        }
+        # Seed every key first so the computed ones keep their table position
+        data = dict.fromkeys(_API_DICT_KEYS)
+        data.update(zip(_API_DICT_ATTR_KEYS, _api_dict_getter(self)))
+        data['host'] = self.get_effective_ip()
+        if self.onvif_service:
+            subscriptions = self.onvif_service.subscriptions.values()
+            data['onvifActiveSubscriptions'] = len(subscriptions)
+            data['onvifSubscribersIPs'] = [sub.client_ip for sub in subscriptions if sub.client_ip]
+        else:
+            data['onvifActiveSubscriptions'] = 0
+            data['onvifSubscribersIPs'] = []
+        return data
     
     def to_config_dict(self):
         """Convert to dictionary for config file (excludes runtime status)"""
-        return {
-            'id': self.id,
-            'uuid': self.uuid,
-            'name': self.name,
-            'mainStreamUrl': self.main_stream_url,
-            'subStreamUrl': self.sub_stream_url,
-            'rtspPort': self.rtsp_port,
-            'onvifPort': self.onvif_port,
-            'pathName': self.path_name,
-            'username': self.username,
-            'password': self.password,
-            'autoStart': self.auto_start,
-            # NOTE: status is NOT saved - it's runtime only
-            # This ensures autoStart setting is respected on server restart
-            'mainWidth': self.main_width,
-            'mainHeight': self.main_height,
-            'subWidth': self._sub_width,
-            'subHeight': self._sub_height,
-            'mainFramerate': self.main_framerate,
-            'subFramerate': self._sub_framerate,
-            'onvifUsername': self.onvif_username,
-            'onvifPassword': self.onvif_password,
-            'transcodeSub': self.transcode_sub,
-            'transcodeMain': self.transcode_main,
-            'disableSubstream': self.disable_substream,
-            'useMainAsSubstream': self.use_main_as_substream,
-            'enableAudio': self.enable_audio,
-            'transcodeMainAudio': self.transcode_main_audio,
-            'transcodeSubAudio': self.transcode_sub_audio,
-            'useVirtualNic': self.use_virtual_nic,
-            'parentInterface': self.parent_interface,
-            'nicMac': self.nic_mac,
-            'ipMode': self.ip_mode,
-            'staticIp': self.static_ip,
-            'netmask': self.netmask,
-            'gateway': self.gateway,
-            'debugMode': self.debug_mode,
-            'enableEventForwarding': self.enable_event_forwarding,
-            'physicalOnvifPort': self.physical_onvif_port,
-            'onvifForwardingUsername': self.onvif_forwarding_username,
-            'onvifForwardingPassword': self.onvif_forwarding_password,
-            'eventSource': self.event_source,
-            'aiTargets': self.ai_targets,
-            'aiModel': self.ai_model,
-            'aiMotionDetectionEnabled': self.ai_motion_detection_enabled,
-            'aiMotionSensitivity': self.ai_motion_sensitivity,
-            'aiConfidenceThreshold': self.ai_confidence_threshold,
-            'aiZone': self.ai_zone,
-            'aiZoneProfiles': self.ai_zone_profiles,
-            'aiActiveZoneProfile': self.ai_active_zone_profile,
-            'sendSmartOnvifTopics': self.send_smart_onvif_topics,
-            'notifyAiEnabled': self.notify_ai_enabled,
-            'notifyAiCooldown': self.notify_ai_cooldown,
-            'notifyAiTargets': self.notify_ai_targets,
-            'notifyAiAttachImage': self.notify_ai_attach_image,
-            'notifyAiLicensePlates': self.notify_ai_license_plates,
-            'notifyAiZoneFilter': self.notify_ai_zone_filter,
-            'notifyAiSchedules': self.notify_ai_schedules,
-            'notifyScheduleEnabled': self.notify_schedule_enabled,
-            'notifyScheduleDays': self.notify_schedule_days,
-            'notifyScheduleStart': self.notify_schedule_start,
-            'notifyScheduleEnd': self.notify_schedule_end,
-        }
+        return dict(zip(_CONFIG_DICT_KEYS, _config_dict_getter(self)))
 
     def _start_keepalive(self, vnic_name):
         """Start the background keepalive loop for the Virtual NIC"""
@@ -25,15 +25,21 @@ if os.path.exists(legacy_mediamtx) and not os.path.exists(new_mediamtx):
         print(f"  [Migration] Moved legacy mediamtx.yml to {new_mediamtx}")
     except Exception as e:
         print(f"  [Migration] Error moving mediamtx.yml: {e}")
+def _get_int_env(name, default):
+    """Read an integer setting from the environment, ignoring bad values"""
+    try:
+        return int(os.environ.get(name, default))
+    except (ValueError, TypeError):
+        return default
+
 # Default Web UI port. Can be overridden via the WEB_UI_PORT environment
 # variable (useful for Docker). A port saved in the Settings UI takes
 # precedence over this default at runtime.
-try:
-    WEB_UI_PORT = int(os.environ.get("WEB_UI_PORT", "5552"))
-except (ValueError, TypeError):
-    WEB_UI_PORT = 5552
+WEB_UI_PORT = _get_int_env("WEB_UI_PORT", 5552)
 MEDIAMTX_PORT = 8554
-MEDIAMTX_API_PORT = 9997
+# MediaMTX control API port, written into mediamtx.yml and polled for
+# analytics. Override with MEDIAMTX_API_PORT if 9997 is taken on the host.
+MEDIAMTX_API_PORT = _get_int_env("MEDIAMTX_API_PORT", 9997)
 
 # AI Defaults
 AI_DEFAULT_MODEL = 'yolov8n.pt'
@@ -1,20 +1,13 @@
 """
 Diagnostics page template for troubleshooting
 """
+import functools
 
-def get_diagnostics_html(theme=''):
-    from .theme_css import APP_THEME_CSS, body_theme_class
-    theme_class = body_theme_class(theme)
-    
-    html = r'''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Diagnostics - Tonys Onvif-RTSP-AI Server</title>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-    <style>
+from .page_assets import minify_css, minify_html, prebuild
+from .theme_css import APP_THEME_CSS, body_theme_class
+
+# Page stylesheet, served separately from the page so the browser can cache it
+_DIAGNOSTICS_CSS = r'''
         :root {
             --bg-color: #0f1012;
             --sidebar-bg: #151619;
@@ -315,6 +308,17 @@ def get_diagnostics_html(theme=''):
             animation: fadeIn 0.2s ease-out;
         }
 
+        @media (prefers-reduced-motion: reduce) {
+            .log-entry { animation: none; }
+        }
+
+        /* Divider after the last line of each diagnostic run */
+        .run-end {
+            border-bottom: 1px dashed var(--border-color);
+            padding-bottom: 6px;
+            margin-bottom: 10px;
+        }
+
         @keyframes fadeIn {
             from { opacity: 0; transform: translateX(5px); }
             to { opacity: 1; transform: translateX(0); }
@@ -550,256 +554,59 @@ def get_diagnostics_html(theme=''):
         .netscan-stat span {
             color: var(--accent-green);
         }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>System Diagnostics</h1>
-        <div class="header-actions">
-            <button class="clear-btn" onclick="clearConsole()">Clear Console</button>
-            <button class="back-btn" onclick="window.location.href='/'">Back to Dashboard</button>
-        </div>
-    </div>
-    
-    <div class="main-layout">
-        <div class="sidebar">
-            <!-- Tab Navigation -->
-            <div class="tab-nav">
-                <button class="tab-btn active" onclick="switchTab('discovery')" data-tab="discovery">
-                    <span class="tab-icon"><i class="fa-solid fa-binoculars"></i></span> Discovery
-                </button>
-                <button class="tab-btn" onclick="switchTab('network')" data-tab="network">
-                    <span class="tab-icon"><i class="fa-solid fa-network-wired"></i></span> Network
-                </button>
-                <button class="tab-btn" onclick="switchTab('camera')" data-tab="camera">
-                    <span class="tab-icon"><i class="fa-solid fa-video"></i></span> Camera
-                </button>
-                <button class="tab-btn" onclick="switchTab('system')" data-tab="system">
-                    <span class="tab-icon"><i class="fa-solid fa-server"></i></span> System
-                </button>
-            </div>
-
-            <!-- ============ DISCOVERY TAB ============ -->
-            <div class="tab-panel active" id="tab-discovery">
-                <div class="tool-section">
-                    <div class="tool-title">ONVIF Camera Discovery</div>
-                    <div class="input-group">
-                        <label>Scan Timeout (seconds)</label>
-                        <select id="scan-timeout">
-                            <option value="3">3 seconds (Quick)</option>
-                            <option value="5" selected>5 seconds (Standard)</option>
-                            <option value="8">8 seconds (Thorough)</option>
-                            <option value="10">10 seconds (Deep)</option>
-                        </select>
-                    </div>
-                    <button class="btn" onclick="runOnvifScan()" id="scan-btn">
-                        Scan for ONVIF Cameras
-                    </button>
-                    <div id="scan-results" style="margin-top: 15px;"></div>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">All Network Devices</div>
-                    <div class="input-group">
-                        <label>Subnet (leave empty to auto-detect)</label>
-                        <input type="text" id="net-subnet" placeholder="e.g. 192.168.1.0/24 (auto-detect)">
-                    </div>
-                    <button class="btn" onclick="runNetworkScan()" id="netscan-btn">
-                        Scan All Devices
-                    </button>
-                    <div id="netscan-results" style="margin-top: 15px;"></div>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">ONVIF Event Live Stream (SOAP Logger)</div>
-                    <div style="display: flex; gap: 10px; margin-bottom: 10px;">
-                        <button class="btn" id="event-toggle-btn" onclick="toggleEventPolling()">Start Live Logging</button>
-                        <button class="btn btn-secondary" onclick="clearEventLogs()">Clear Logs</button>
-                    </div>
-                    <div id="event-stream-results" style="margin-top: 15px; font-family: monospace; font-size: 11px;"></div>
-                </div>
-            </div>
-
-            <!-- ============ NETWORK TAB ============ -->
-            <div class="tab-panel" id="tab-network">
-                <div class="tool-section">
-                    <div class="tool-title">Ping</div>
-                    <div class="input-group">
-                        <label>Target Host or IP</label>
-                        <input type="text" id="ping-host" placeholder="e.g. 192.168.1.100">
-                    </div>
-                    <div class="input-group">
-                        <label>Count</label>
-                        <input type="number" id="ping-count" value="4" min="1" max="10">
-                    </div>
-                    <button class="btn" onclick="runPing()" id="ping-btn">Run Ping</button>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">Traceroute</div>
-                    <div class="input-group">
-                        <label>Target Host or IP</label>
-                        <input type="text" id="trace-host" placeholder="e.g. example.com">
-                    </div>
-                    <button class="btn" onclick="runTraceroute()" id="trace-btn">Run Traceroute</button>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">Port Check</div>
-                    <div class="input-group">
-                        <label>Host</label>
-                        <input type="text" id="port-host" placeholder="e.g. 192.168.1.50">
-                    </div>
-                    <div class="input-group">
-                        <label>Port</label>
-                        <input type="number" id="port-number" placeholder="554" min="1" max="65535">
-                    </div>
-                    <button class="btn" onclick="checkPort()" id="port-btn">Check Port</button>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">Network Interface Bandwidth Monitor</div>
-                    <button class="btn" id="bandwidth-toggle-btn" onclick="toggleBandwidthMonitoring()">Start Bandwidth Monitor</button>
-                    <div id="bandwidth-results" style="margin-top: 15px;"></div>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">MediaMTX Live Connections Monitor</div>
-                    <button class="btn" onclick="refreshMediaMtxConnections()" id="mediamtx-connections-btn">Refresh Connections</button>
-                    <div id="mediamtx-connections-results" style="margin-top: 15px;"></div>
-                </div>
-            </div>
-
-            <!-- ============ CAMERA TAB ============ -->
-            <div class="tab-panel" id="tab-camera">
-                <div class="tool-section">
-                    <div class="tool-title">ONVIF Diagnostics</div>
-                    <div class="input-group">
-                        <label>Quick Select Camera</label>
-                        <select id="onvif-camera-select" onchange="handleOnvifCameraSelect()">
-                            <option value="">- Manual Input -</option>
-                        </select>
-                    </div>
-                    <div class="divider"></div>
-                    <div class="input-group">
-                        <label>Host/IP</label>
-                        <input type="text" id="onvif-host" placeholder="192.168.1.100">
-                    </div>
-                    <div class="input-group">
-                        <label>ONVIF Port</label>
-                        <input type="number" id="onvif-port" value="80" min="1" max="65535">
-                    </div>
-                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
-                        <div class="input-group">
-                            <label>Username</label>
-                            <input type="text" id="onvif-user" placeholder="admin">
-                        </div>
-                        <div class="input-group">
-                            <label>Password</label>
-                            <input type="password" id="onvif-pass" placeholder="password">
-                        </div>
-                    </div>
-                    <button class="btn" onclick="runOnvifDiag()" id="onvif-btn">Run ONVIF Diag</button>
-                </div>
-
-                <div class="tool-section">
-                    <div class="tool-title">RTSP Stream Test</div>
-                    <div class="input-group">
-                        <label>Quick Select Camera</label>
-                        <select id="camera-select" onchange="handleCameraSelect()">
-                            <option value="">- Manual Input -</option>
-                        </select>
-                    </div>
-                    <div class="input-group" id="stream-type-group" style="display: none;">
-                        <label>Stream Type</label>
-                        <select id="stream-type" onchange="handleCameraSelect()">
-                            <option value="main">Main Stream</option>
-                            <option value="sub">Sub Stream</option>
-                        </select>
-                    </div>
-                    <div class="divider"></div>
-                    <div class="input-group">
-                        <label>Host/IP & Path</label>
-                        <input type="text" id="stream-host" placeholder="192.168.1.100:554/stream">
-                    </div>
-                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
-                        <div class="input-group">
-                            <label>Username</label>
-                            <input type="text" id="stream-user" placeholder="admin">
-                        </div>
-                        <div class="input-group">
-                            <label>Password</label>
-                            <input type="password" id="stream-pass" placeholder="password">
-                        </div>
-                    </div>
-                    <button class="btn" onclick="testStream()" id="stream-btn">Test Connection</button>
-                </div>
+'''
 
-                <div class="tool-section">
-                    <div class="tool-title">RTSP Latency & Jitter Analyzer</div>
-                    <div class="input-group">
-                        <label>Quick Select Camera</label>
-                        <select id="analyzer-camera-select" onchange="handleAnalyzerCameraSelect()">
-                            <option value="">- Manual Input -</option>
-                        </select>
-                    </div>
-                    <div class="input-group">
-                        <label>RTSP Stream URL</label>
-                        <input type="text" id="analyzer-stream-url" placeholder="rtsp://192.168.1.100:554/stream">
-                    </div>
-                    <button class="btn" onclick="runRtspAnalyzer()" id="analyzer-btn">Run RTSP Analysis</button>
-                </div>
-            </div>
+# Page script, served separately (and deferred) so it does not block parsing
+_DIAGNOSTICS_JS = r'''
+        // Element lookups are done once; the script is deferred so the DOM
+        // is fully parsed by the time this runs.
+        const E = {
+            console: document.getElementById('console'),
+            cameraSelect: document.getElementById('camera-select'),
+            onvifCameraSelect: document.getElementById('onvif-camera-select'),
+            analyzerCameraSelect: document.getElementById('analyzer-camera-select'),
+            transcodeCameraSelect: document.getElementById('transcode-camera-select'),
+            onvifHost: document.getElementById('onvif-host'),
+            onvifPort: document.getElementById('onvif-port'),
+            onvifUser: document.getElementById('onvif-user'),
+            onvifPass: document.getElementById('onvif-pass'),
+            streamTypeGroup: document.getElementById('stream-type-group'),
+            streamType: document.getElementById('stream-type'),
+            streamHost: document.getElementById('stream-host'),
+            streamUser: document.getElementById('stream-user'),
+            streamPass: document.getElementById('stream-pass'),
+            scanTimeout: document.getElementById('scan-timeout'),
+            scanBtn: document.getElementById('scan-btn'),
+            scanResults: document.getElementById('scan-results'),
+            netSubnet: document.getElementById('net-subnet'),
+            netscanBtn: document.getElementById('netscan-btn'),
+            netscanResults: document.getElementById('netscan-results'),
+            onvifBtn: document.getElementById('onvif-btn'),
+            pingHost: document.getElementById('ping-host'),
+            pingCount: document.getElementById('ping-count'),
+            pingBtn: document.getElementById('ping-btn'),
+            traceHost: document.getElementById('trace-host'),
+            traceBtn: document.getElementById('trace-btn'),
+            streamBtn: document.getElementById('stream-btn'),
+            portHost: document.getElementById('port-host'),
+            portNumber: document.getElementById('port-number'),
+            portBtn: document.getElementById('port-btn'),
+            ffmpegBtn: document.getElementById('ffmpeg-btn'),
+            systemBtn: document.getElementById('system-btn'),
+            aiBtn: document.getElementById('ai-btn'),
+            analyzerStreamUrl: document.getElementById('analyzer-stream-url'),
+            analyzerBtn: document.getElementById('analyzer-btn'),
+            eventToggleBtn: document.getElementById('event-toggle-btn'),
+            eventStreamResults: document.getElementById('event-stream-results'),
+            bandwidthToggleBtn: document.getElementById('bandwidth-toggle-btn'),
+            bandwidthResults: document.getElementById('bandwidth-results'),
+            mediamtxConnectionsBtn: document.getElementById('mediamtx-connections-btn'),
+            mediamtxConnectionsResults: document.getElementById('mediamtx-connections-results'),
+            transcodeEncoder: document.getElementById('transcode-encoder'),
+            transcodeCalcBtn: document.getElementById('transcode-calc-btn'),
+            storageCheckBtn: document.getElementById('storage-check-btn')
+        };
 
-            <!-- ============ SYSTEM TAB ============ -->
-            <div class="tab-panel" id="tab-system">
-                <div class="tool-section">
-                    <div class="tool-title">System Health</div>
-                    <button class="btn" onclick="getSystemInfo()" id="system-btn">Get System Info</button>
-                </div>
-                <div class="tool-section">
-                    <div class="tool-title">FFmpeg Environment</div>
-                    <button class="btn" onclick="getFFmpegInfo()" id="ffmpeg-btn">Get FFmpeg Info</button>
-                </div>
-                <div class="tool-section">
-                    <div class="tool-title">Local AI Diagnostics</div>
-                    <button class="btn" onclick="getAIInfo()" id="ai-btn">Get AI Info</button>
-                </div>
-                <div class="tool-section">
-                    <div class="tool-title">FFmpeg Transcode Calculator</div>
-                    <div class="input-group">
-                        <label>Select Camera</label>
-                        <select id="transcode-camera-select">
-                            <option value="">- Choose Camera -</option>
-                        </select>
-                    </div>
-                    <div class="input-group">
-                        <label>Encoder Driver</label>
-                        <select id="transcode-encoder">
-                            <option value="libx264">Software CPU (libx264)</option>
-                            <option value="h264_videotoolbox">macOS Hardware VideoToolbox (h264_videotoolbox)</option>
-                            <option value="h264_nvenc">Nvidia GPU NVENC (h264_nvenc)</option>
-                            <option value="h264_vaapi">Linux Hardware VAAPI (h264_vaapi)</option>
-                            <option value="h264_qsv">Intel QuickSync QSV (h264_qsv)</option>
-                        </select>
-                    </div>
-                    <button class="btn" onclick="runTranscodeCalculator()" id="transcode-calc-btn">Run Transcode Test</button>
-                </div>
-                <div class="tool-section">
-                    <div class="tool-title">Storage I/O Performance Check</div>
-                    <button class="btn" onclick="runStorageCheck()" id="storage-check-btn">Run Disk Benchmark</button>
-                </div>
-            </div>
-        </div>
-        
-        <div class="content">
-            <div class="output-console" id="console">
-                <div class="placeholder-text">Diagnostic output will be displayed here...</div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
         function switchTab(tabId) {
             // Hide all tab panels
             document.querySelectorAll('.tab-panel').forEach(panel => {
@@ -821,32 +628,387 @@ def get_diagnostics_html(theme=''):
             }
         }
 
-        const consoleEl = document.getElementById('console');
-        let hasOutput = false;
-        let camerasData = [];
+        // One delegated listener for every sidebar button: tabs carry
+        // data-tab, tool buttons name their handler (or TOOLS entry) in
+        // data-action.
+        const SIDEBAR_ACTIONS = {
+            runOnvifScan, runNetworkScan, toggleEventPolling, clearEventLogs,
+            toggleBandwidthMonitoring, refreshMediaMtxConnections, runOnvifDiag,
+            testStream, runRtspAnalyzer, getAIInfo, runTranscodeCalculator
+        };
 
-        function log(message, type = 'info') {
-            if (!hasOutput) {
-                consoleEl.innerHTML = '';
-                hasOutput = true;
-            }
+        // Requests that can be cancelled, keyed by the button that started
+        // them. While one is running its button stays clickable and a second
+        // click aborts it rather than leaving a stuck request to time out.
+        const inflight = new Map();
 
-            const entry = document.createElement('div');
-            entry.className = 'log-entry';
-            
-            const timestamp = new Date().toLocaleTimeString();
-            let colorClass = 'log-info';
-            if (type === 'error') colorClass = 'log-error';
-            if (type === 'success') colorClass = 'log-success';
-            if (type === 'warn') colorClass = 'log-warn';
-            if (type === 'purple') colorClass = 'log-purple';
+        // Built once and cloned, instead of parsing spinner markup per click
+        const SPINNER = document.createElement('div');
+        SPINNER.className = 'spinner';
 
-            entry.innerHTML = `<span class="log-timestamp">[${timestamp}]</span><span class="${colorClass}">${message}</span>`;
-            consoleEl.appendChild(entry);
-            consoleEl.scrollTop = consoleEl.scrollHeight;
+        // Swap a button's label for the spinner; returns a function that
+        // puts the original label back.
+        function showSpinner(btn, label) {
+            const originalText = btn.textContent;
+            btn.replaceChildren(SPINNER.cloneNode(), ' ' + label);
+            return () => { btn.textContent = originalText; };
+        }
+
+        // Disable a button for the duration of a run; call the returned
+        // function when finished.
+        function busy(btn, label) {
+            btn.disabled = true;
+            const restore = showSpinner(btn, label);
+            return () => {
+                btn.disabled = false;
+                restore();
+            };
+        }
+
+        // Like busy(), but the button stays clickable and a second click
+        // aborts the request through the returned signal.
+        function beginRequest(btn, label) {
+            const ctrl = new AbortController();
+            inflight.set(btn, ctrl);
+            btn.title = 'Click again to cancel';
+            const restore = showSpinner(btn, label);
+            return {
+                signal: ctrl.signal,
+                done() {
+                    inflight.delete(btn);
+                    btn.title = '';
+                    restore();
+                }
+            };
+        }
+
+        document.querySelector('.sidebar').addEventListener('click', (e) => {
+            const btn = e.target.closest('button');
+            if (!btn) return;
+            const running = inflight.get(btn);
+            if (running) {
+                running.abort();
+                return;
+            }
+            if (btn.disabled) return;
+            if (btn.dataset.tab) {
+                switchTab(btn.dataset.tab);
+                return;
+            }
+            const action = btn.dataset.action;
+            if (TOOLS[action]) {
+                runTool(TOOLS[action]);
+                return;
+            }
+            const handler = SIDEBAR_ACTIONS[action];
+            if (handler) handler();
+        });
+
+        const consoleEl = E.console;
+        let hasOutput = false;
+        let camerasData = [];
+
+        // Upper bounds so repeated runs and huge command dumps can't grow the DOM forever
+        const MAX_CONSOLE_NODES = 500;
+        const MAX_OUTPUT_LINES = 500;
+
+        // Console writes are queued and flushed as one DocumentFragment, so a
+        // burst of log() calls costs a single DOM insert and a single layout.
+        let pendingNodes = [];
+        let flushScheduled = false;
+        const MAX_ANIMATED_ENTRIES = 8;
+
+        function flushLog() {
+            flushScheduled = false;
+            if (pendingNodes.length === 0) return;
+            if (!hasOutput) {
+                consoleEl.innerHTML = '';
+                hasOutput = true;
+            }
+            const frag = document.createDocumentFragment();
+            // Only the first few lines of a large burst fade in; animating
+            // every line of a long dump costs far more than it shows
+            pendingNodes.forEach((node, i) => {
+                if (i >= MAX_ANIMATED_ENTRIES) node.style.animation = 'none';
+                frag.appendChild(node);
+            });
+            pendingNodes = [];
+            consoleEl.appendChild(frag);
+            // Drop the oldest entries once the console is over its cap
+            let excess = consoleEl.childElementCount - MAX_CONSOLE_NODES;
+            while (excess-- > 0) {
+                const oldest = consoleEl.firstElementChild;
+                releaseEntry(oldest);
+                consoleEl.removeChild(oldest);
+            }
+            scheduleScroll();
+        }
+
+        // Free the full-output blob a logOutput() entry holds, if any;
+        // otherwise the text stays in memory after the entry is gone
+        function releaseEntry(node) {
+            if (node.dataset.blobUrl) URL.revokeObjectURL(node.dataset.blobUrl);
+        }
+
+        // Scroll to the bottom at most once per frame, however many flushes ran
+        let scrollPending = false;
+        function scheduleScroll() {
+            if (scrollPending) return;
+            scrollPending = true;
+            requestAnimationFrame(() => {
+                consoleEl.scrollTop = consoleEl.scrollHeight;
+                scrollPending = false;
+            });
+        }
+
+        // Queue any element for the console, keeping it in order with log() lines
+        function logNode(node) {
+            pendingNodes.push(node);
+            if (!flushScheduled) {
+                flushScheduled = true;
+                queueMicrotask(flushLog);
+            }
+        }
+
+        // Formatting a locale time string is comparatively costly and a burst
+        // of log lines shares the same second, so format once per second.
+        let stampSecond = -1;
+        let stampText = '';
+
+        function timestampText() {
+            const second = Math.floor(Date.now() / 1000);
+            if (second !== stampSecond) {
+                stampSecond = second;
+                stampText = `[${new Date(second * 1000).toLocaleTimeString()}]`;
+            }
+            return stampText;
+        }
+
+        // Mark the end of a tool run by styling its last console line
+        // rather than logging a separator line
+        function endRun() {
+            const last = pendingNodes.length ? pendingNodes[pendingNodes.length - 1] : consoleEl.lastElementChild;
+            if (last) last.classList.add('run-end');
+        }
+
+        function log(message, type = 'info') {
+            const entry = document.createElement('div');
+            entry.className = 'log-entry';
+            
+            let colorClass = 'log-info';
+            if (type === 'error') colorClass = 'log-error';
+            if (type === 'success') colorClass = 'log-success';
+            if (type === 'warn') colorClass = 'log-warn';
+            if (type === 'purple') colorClass = 'log-purple';
+
+            // Build the spans directly: no HTML parsing, and server-supplied
+            // text (errors, command output) can never be interpreted as markup
+            const ts = document.createElement('span');
+            ts.className = 'log-timestamp';
+            ts.textContent = timestampText();
+            const msg = document.createElement('span');
+            msg.className = colorClass;
+            msg.textContent = message;
+            entry.append(ts, msg);
+            logNode(entry);
+        }
+
+        // Log raw command output, keeping only the tail of very long dumps on
+        // screen and offering the complete text as a download instead
+        function logOutput(text, type = 'info') {
+            const lines = (text || '').split('\n');
+            if (lines.length <= MAX_OUTPUT_LINES) {
+                log(text, type);
+                return;
+            }
+            const entry = document.createElement('div');
+            entry.className = 'log-entry';
+            const link = document.createElement('a');
+            link.className = 'log-warn';
+            link.href = entry.dataset.blobUrl = URL.createObjectURL(new Blob([text], {type: 'text/plain'}));
+            link.download = 'diagnostics-output.txt';
+            link.textContent = `Showing the last ${MAX_OUTPUT_LINES} of ${lines.length} lines. Download full output`;
+            entry.appendChild(link);
+            logNode(entry);
+            log(lines.slice(-MAX_OUTPUT_LINES).join('\n'), type);
+        }
+
+        // Short-lived cache for read-only info endpoints whose answers rarely
+        // change (versions, platform, core count). Failed lookups aren't cached.
+        const INFO_CACHE_TTL_MS = 30000;
+        const infoCache = new Map();
+
+        async function cachedFetchJson(url, options) {
+            const hit = infoCache.get(url);
+            if (hit && hit.expiry > Date.now()) return hit.data;
+            const response = await fetch(url, options);
+            const data = await response.json();
+            if (data.success) infoCache.set(url, {data, expiry: Date.now() + INFO_CACHE_TTL_MS});
+            return data;
+        }
+
+        // Plain request/response tools share one runner. Each descriptor
+        // names its button and endpoint, validates its inputs (returning null
+        // to abort) and logs a successful result; the spinner, cancellation
+        // and error reporting are handled here.
+        const TOOLS = {
+            ping: {
+                btn: E.pingBtn,
+                label: 'Running...',
+                url: '/api/diagnostics/ping',
+                method: 'POST',
+                params() {
+                    const host = E.pingHost.value;
+                    if (!host) {
+                        log('Error: Please enter a target host.', 'error');
+                        return null;
+                    }
+                    return {host, count: E.pingCount.value};
+                },
+                start: p => log(`Starting ping request to ${p.host} (Count: ${p.count})...`, 'purple'),
+                onOk(data) {
+                    logOutput(data.output);
+                    log('Ping completed successfully.', 'success');
+                },
+                failure: 'Ping failed: '
+            },
+            traceroute: {
+                btn: E.traceBtn,
+                label: 'Running...',
+                url: '/api/diagnostics/traceroute',
+                method: 'POST',
+                params() {
+                    const host = E.traceHost.value;
+                    if (!host) {
+                        log('Error: Please enter a target host.', 'error');
+                        return null;
+                    }
+                    return {host};
+                },
+                start: p => log(`Tracing route to ${p.host}. Please wait, this may take up to 60 seconds...`, 'purple'),
+                onOk(data) {
+                    logOutput(data.output);
+                    log('Traceroute completed.', 'success');
+                },
+                failure: 'Traceroute failed: '
+            },
+            portCheck: {
+                btn: E.portBtn,
+                label: 'Checking...',
+                url: '/api/diagnostics/port-check',
+                method: 'POST',
+                params() {
+                    const host = E.portHost.value;
+                    const port = E.portNumber.value;
+                    if (!host || !port) {
+                        log('Error: Host and port are required.', 'error');
+                        return null;
+                    }
+                    return {host, port};
+                },
+                start: p => log(`Checking connectivity to ${p.host}:${p.port}...`, 'purple'),
+                onOk(data, p) {
+                    if (data.open) {
+                        log(`✓ Port ${p.port} is OPEN on ${p.host}.`, 'success');
+                    } else {
+                        log(`✗ Port ${p.port} is CLOSED or restricted on ${p.host}.`, 'error');
+                    }
+                },
+                failure: 'Error performing check: '
+            },
+            ffmpegInfo: {
+                btn: E.ffmpegBtn,
+                label: '...',
+                url: '/api/diagnostics/ffmpeg-info',
+                cached: true,
+                start: () => log('Retrieving FFmpeg environment details...', 'purple'),
+                onOk(data) {
+                    log(`Active Version: ${data.version}`, 'info');
+                    log('-- Full Output --');
+                    logOutput(data.full_output);
+                }
+            },
+            systemInfo: {
+                btn: E.systemBtn,
+                label: '...',
+                url: '/api/diagnostics/system-info',
+                cached: true,
+                start: () => log('Gathering system health and hardware metrics...', 'purple'),
+                onOk(data) {
+                    log(`System Info:`, 'info');
+                    log(`  OS Platform:      ${data.platform}`);
+                    log(`  Python Version:   ${data.python_version}`);
+                    log(`  CPU Cores:        ${data.cpu_count}`);
+                    log(`  Memory Usage:     ${data.available_memory}GB available / ${data.total_memory}GB total`);
+                    log(`  Disk Usage:       ${data.disk_usage}%`);
+                    log(`  MediaMTX Version: ${data.mediamtx_version}`, 'purple');
+                    log(`  FFmpeg Version:   ${data.ffmpeg_version}`, 'purple');
+                }
+            },
+            storageCheck: {
+                btn: E.storageCheckBtn,
+                label: 'Benchmarking...',
+                url: '/api/diagnostics/storage-check',
+                start() {
+                    log('Starting Storage I/O Read/Write Speed Benchmark (20MB test)...', 'purple');
+                    log('Benchmarking directory. Please wait a few seconds...', 'info');
+                },
+                onOk(data) {
+                    log('✓ Storage benchmark complete.', 'success');
+                    log(`Storage Path: ${data.storage_path}`, 'info');
+                    log(`  • Read Speed:         ${data.read_speed_mbs} MB/s`, 'success');
+                    log(`  • Write Speed:        ${data.write_speed_mbs} MB/s`, 'success');
+                    log(`  • Performance Rating: ${data.performance_rating}`, 'purple');
+                    log(`  • Disk Space:         ${data.free_gb} GB Free / ${data.total_gb} GB Total (${data.used_percent}% used)`);
+                },
+                failure: '✗ Storage check failed: '
+            }
+        };
+
+        async function runTool(tool) {
+            const params = tool.params ? tool.params() : {};
+            if (!params) return;
+
+            const btn = tool.btn;
+            const {signal, done} = beginRequest(btn, tool.label);
+
+            tool.start(params);
+
+            try {
+                let data;
+                if (tool.cached) {
+                    data = await cachedFetchJson(tool.url, {signal});
+                } else {
+                    const options = {signal};
+                    if (tool.method === 'POST') {
+                        options.method = 'POST';
+                        options.body = new URLSearchParams(params);
+                    }
+                    const response = await fetch(tool.url, options);
+                    data = await response.json();
+                }
+
+                if (data.success) {
+                    tool.onOk(data, params);
+                } else {
+                    log((tool.failure || 'Error: ') + data.error, 'error');
+                }
+            } catch (error) {
+                if (error.name === 'AbortError') {
+                    log('Request cancelled.', 'warn');
+                } else {
+                    log('Connection error: ' + error.message, 'error');
+                }
+            } finally {
+                done();
+                endRun();
+            }
         }
 
         function clearConsole() {
+            pendingNodes.forEach(releaseEntry);
+            consoleEl.querySelectorAll('[data-blob-url]').forEach(releaseEntry);
+            pendingNodes = [];
             consoleEl.innerHTML = '<div class="placeholder-text">Console cleared. Waiting for next tool...</div>';
             hasOutput = false;
         }
@@ -856,10 +1018,10 @@ def get_diagnostics_html(theme=''):
             try {
                 const response = await fetch('/api/cameras');
                 camerasData = await response.json();
-                const select = document.getElementById('camera-select');
-                const onvifSelect = document.getElementById('onvif-camera-select');
-                const analyzerSelect = document.getElementById('analyzer-camera-select');
-                const transcodeSelect = document.getElementById('transcode-camera-select');
+                const select = E.cameraSelect;
+                const onvifSelect = E.onvifCameraSelect;
+                const analyzerSelect = E.analyzerCameraSelect;
+                const transcodeSelect = E.transcodeCameraSelect;
                 
                 camerasData.forEach(cam => {
                     const opt = document.createElement('option');
@@ -886,23 +1048,23 @@ def get_diagnostics_html(theme=''):
         }
 
         function handleOnvifCameraSelect() {
-            const select = document.getElementById('onvif-camera-select');
+            const select = E.onvifCameraSelect;
             if (!select.value) return;
 
             const camera = camerasData.find(c => c.id == select.value);
             if (camera) {
-                document.getElementById('onvif-host').value = camera.host;
-                document.getElementById('onvif-port').value = camera.onvifPort || 80;
-                document.getElementById('onvif-user').value = camera.onvifUsername || camera.username || '';
-                document.getElementById('onvif-pass').value = camera.onvifPassword || camera.password || '';
+                E.onvifHost.value = camera.host;
+                E.onvifPort.value = camera.onvifPort || 80;
+                E.onvifUser.value = camera.onvifUsername || camera.username || '';
+                E.onvifPass.value = camera.onvifPassword || camera.password || '';
                 log(`Selected Camera for ONVIF Diag: ${camera.name}`, 'purple');
             }
         }
 
         function handleCameraSelect() {
-            const select = document.getElementById('camera-select');
-            const typeGroup = document.getElementById('stream-type-group');
-            const typeSelect = document.getElementById('stream-type');
+            const select = E.cameraSelect;
+            const typeGroup = E.streamTypeGroup;
+            const typeSelect = E.streamType;
             
             if (!select.value) {
                 typeGroup.style.display = 'none';
@@ -921,9 +1083,9 @@ def get_diagnostics_html(theme=''):
                     hostPath = hostPath.split('@')[1];
                 }
                 
-                document.getElementById('stream-host').value = hostPath;
-                document.getElementById('stream-user').value = camera.username || '';
-                document.getElementById('stream-pass').value = camera.password || '';
+                E.streamHost.value = hostPath;
+                E.streamUser.value = camera.username || '';
+                E.streamPass.value = camera.password || '';
                 
                 log(`Selected Camera: ${camera.name} (${typeSelect.value} stream)`, 'purple');
             }
@@ -936,13 +1098,11 @@ def get_diagnostics_html(theme=''):
         let scanResults = [];
 
         async function runOnvifScan() {
-            const timeout = document.getElementById('scan-timeout').value;
-            const btn = document.getElementById('scan-btn');
-            const resultsDiv = document.getElementById('scan-results');
+            const timeout = E.scanTimeout.value;
+            const btn = E.scanBtn;
+            const resultsDiv = E.scanResults;
 
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Scanning...';
+            const {signal, done} = beginRequest(btn, 'Scanning...');
             resultsDiv.innerHTML = '<div style="text-align:center; color: var(--text-muted); font-size: 12px; padding: 10px;">Sending WS-Discovery probes...</div>';
 
             log(`Starting ONVIF network scan (timeout: ${timeout}s)...`, 'purple');
@@ -950,6 +1110,7 @@ def get_diagnostics_html(theme=''):
 
             try {
                 const response = await fetch('/api/diagnostics/onvif-scan', {
+                    signal,
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify({timeout: parseInt(timeout)})
@@ -1002,13 +1163,16 @@ def get_diagnostics_html(theme=''):
                     resultsDiv.innerHTML = '<div class="scan-empty" style="color: var(--accent-red);">Scan failed: ' + data.error + '</div>';
                 }
             } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-                resultsDiv.innerHTML = '<div class="scan-empty" style="color: var(--accent-red);">Error: ' + error.message + '</div>';
+                if (error.name === 'AbortError') {
+                    log('Request cancelled.', 'warn');
+                    resultsDiv.innerHTML = '';
+                } else {
+                    log('Connection error: ' + error.message, 'error');
+                    resultsDiv.innerHTML = '<div class="scan-empty" style="color: var(--accent-red);">Error: ' + error.message + '</div>';
+                }
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-                consoleEl.scrollTop = consoleEl.scrollHeight;
+                done();
+                endRun();
             }
         }
 
@@ -1016,11 +1180,11 @@ def get_diagnostics_html(theme=''):
             const dev = scanResults[idx];
             if (!dev) return;
 
-            document.getElementById('onvif-host').value = dev.ip;
-            document.getElementById('onvif-port').value = dev.port;
+            E.onvifHost.value = dev.ip;
+            E.onvifPort.value = dev.port;
 
             // Clear the camera select dropdown since we're using manual input
-            document.getElementById('onvif-camera-select').value = '';
+            E.onvifCameraSelect.value = '';
 
             log(`Loaded scan result into ONVIF Diagnostics: ${dev.name} (${dev.ip}:${dev.port})`, 'purple');
             log('Enter credentials and click "Run ONVIF Diag" to probe this device.', 'info');
@@ -1029,18 +1193,16 @@ def get_diagnostics_html(theme=''):
             switchTab('camera');
 
             // Scroll the sidebar to show the ONVIF Diagnostics section
-            document.getElementById('onvif-host').scrollIntoView({ behavior: 'smooth', block: 'center' });
-            document.getElementById('onvif-host').focus();
+            E.onvifHost.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            E.onvifHost.focus();
         }
 
         async function runNetworkScan() {
-            const subnet = document.getElementById('net-subnet').value;
-            const btn = document.getElementById('netscan-btn');
-            const resultsDiv = document.getElementById('netscan-results');
+            const subnet = E.netSubnet.value;
+            const btn = E.netscanBtn;
+            const resultsDiv = E.netscanResults;
 
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Scanning...';
+            const {signal, done} = beginRequest(btn, 'Scanning...');
             resultsDiv.innerHTML = '<div style="text-align:center; color: var(--text-muted); font-size: 12px; padding: 10px;">Ping sweeping subnet... this may take 5-10 seconds</div>';
 
             log('Starting network device scan...', 'purple');
@@ -1055,6 +1217,7 @@ def get_diagnostics_html(theme=''):
                 if (subnet) body.subnet = subnet;
 
                 const response = await fetch('/api/diagnostics/network-scan', {
+                    signal,
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify(body)
@@ -1128,36 +1291,38 @@ def get_diagnostics_html(theme=''):
                     resultsDiv.innerHTML = '<div class="scan-empty" style="color: var(--accent-red);">Scan failed: ' + data.error + '</div>';
                 }
             } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-                resultsDiv.innerHTML = '<div class="scan-empty" style="color: var(--accent-red);">Error: ' + error.message + '</div>';
+                if (error.name === 'AbortError') {
+                    log('Request cancelled.', 'warn');
+                    resultsDiv.innerHTML = '';
+                } else {
+                    log('Connection error: ' + error.message, 'error');
+                    resultsDiv.innerHTML = '<div class="scan-empty" style="color: var(--accent-red);">Error: ' + error.message + '</div>';
+                }
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-                consoleEl.scrollTop = consoleEl.scrollHeight;
+                done();
+                endRun();
             }
         }
 
         async function runOnvifDiag() {
-            const host = document.getElementById('onvif-host').value;
-            const port = document.getElementById('onvif-port').value;
-            const user = document.getElementById('onvif-user').value;
-            const pass = document.getElementById('onvif-pass').value;
-            const btn = document.getElementById('onvif-btn');
+            const host = E.onvifHost.value;
+            const port = E.onvifPort.value;
+            const user = E.onvifUser.value;
+            const pass = E.onvifPass.value;
+            const btn = E.onvifBtn;
             
             if (!host || !user || !pass) {
                 log('Error: Host, username, and password are required.', 'error');
                 return;
             }
             
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Running...';
+            const {signal, done} = beginRequest(btn, 'Running...');
             
             log(`Starting ONVIF diagnostics for ${host}:${port}...`, 'purple');
             
             try {
                 const response = await fetch('/api/diagnostics/onvif', {
+                    signal,
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify({host, port: parseInt(port), username: user, password: pass})
@@ -1195,7 +1360,7 @@ def get_diagnostics_html(theme=''):
                                 
                                 details.appendChild(reqDiv);
                                 details.appendChild(respDiv);
-                                consoleEl.appendChild(details);
+                                logNode(details);
                             }
                         } else {
                             log(`Status: FAILED`, 'error');
@@ -1207,97 +1372,22 @@ def get_diagnostics_html(theme=''):
                     log('Error: ' + data.error, 'error');
                 }
             } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-            } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-                consoleEl.scrollTop = consoleEl.scrollHeight;
-            }
-        }
-
-        async function runPing() {
-            const host = document.getElementById('ping-host').value;
-            const count = document.getElementById('ping-count').value;
-            const btn = document.getElementById('ping-btn');
-            
-            if (!host) {
-                log('Error: Please enter a target host.', 'error');
-                return;
-            }
-            
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Running...';
-            
-            log(`Starting ping request to ${host} (Count: ${count})...`, 'purple');
-            
-            try {
-                const response = await fetch('/api/diagnostics/ping', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({host, count: parseInt(count)})
-                });
-                
-                const data = await response.json();
-                if (data.success) {
-                    log(data.output);
-                    log('Ping completed successfully.', 'success');
-                } else {
-                    log('Ping failed: ' + data.error, 'error');
-                }
-            } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-            } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-            }
-        }
-        
-        async function runTraceroute() {
-            const host = document.getElementById('trace-host').value;
-            const btn = document.getElementById('trace-btn');
-            
-            if (!host) {
-                log('Error: Please enter a target host.', 'error');
-                return;
-            }
-            
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Running...';
-            
-            log(`Tracing route to ${host}. Please wait, this may take up to 60 seconds...`, 'purple');
-            
-            try {
-                const response = await fetch('/api/diagnostics/traceroute', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({host})
-                });
-                
-                const data = await response.json();
-                if (data.success) {
-                    log(data.output);
-                    log('Traceroute completed.', 'success');
+                if (error.name === 'AbortError') {
+                    log('Request cancelled.', 'warn');
                 } else {
-                    log('Traceroute failed: ' + data.error, 'error');
+                    log('Connection error: ' + error.message, 'error');
                 }
-            } catch (error) {
-                log('Connection error: ' + error.message, 'error');
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
+                done();
+                endRun();
             }
         }
-        
+
         async function testStream() {
-            const host = document.getElementById('stream-host').value;
-            const user = document.getElementById('stream-user').value;
-            const pass = document.getElementById('stream-pass').value;
-            const btn = document.getElementById('stream-btn');
+            const host = E.streamHost.value;
+            const user = E.streamUser.value;
+            const pass = E.streamPass.value;
+            const btn = E.streamBtn;
             
             if (!host) {
                 log('Error: Please enter the stream Host/IP & Path.', 'error');
@@ -1319,9 +1409,7 @@ def get_diagnostics_html(theme=''):
                 fullUrl = `rtsp://${fullUrl}`;
             }
             
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Testing...';
+            const {signal, done} = beginRequest(btn, 'Testing...');
             
             log(`Analyzing stream properties for camera at ${host}...`, 'purple');
             if (user) log(`Using credentials for user: ${user}`, 'info');
@@ -1332,6 +1420,7 @@ def get_diagnostics_html(theme=''):
             
             try {
                 const response = await fetch('/api/diagnostics/stream-test', {
+                    signal,
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify({url: fullUrl})
@@ -1373,129 +1462,27 @@ def get_diagnostics_html(theme=''):
                     pre.style.fontSize = '12px';
                     pre.style.color = '#bd93f9';
                     pre.textContent = JSON.stringify(data.raw, null, 2);
-                    consoleEl.appendChild(pre);
+                    logNode(pre);
 
                 } else {
                     log('✗ Stream test failed.', 'error');
                     log('Error output: ' + data.error, 'error');
                 }
             } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-            } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-            }
-        }
-        
-        async function checkPort() {
-            const host = document.getElementById('port-host').value;
-            const port = document.getElementById('port-number').value;
-            const btn = document.getElementById('port-btn');
-            
-            if (!host || !port) {
-                log('Error: Host and port are required.', 'error');
-                return;
-            }
-            
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Checking...';
-            
-            log(`Checking connectivity to ${host}:${port}...`, 'purple');
-            
-            try {
-                const response = await fetch('/api/diagnostics/port-check', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({host, port: parseInt(port)})
-                });
-                
-                const data = await response.json();
-                if (data.success) {
-                    if (data.open) {
-                        log(`✓ Port ${port} is OPEN on ${host}.`, 'success');
-                    } else {
-                        log(`✗ Port ${port} is CLOSED or restricted on ${host}.`, 'error');
-                    }
-                } else {
-                    log('Error performing check: ' + data.error, 'error');
-                }
-            } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-            } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-            }
-        }
-        
-        async function getFFmpegInfo() {
-            const btn = document.getElementById('ffmpeg-btn');
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> ...';
-            
-            log('Retrieving FFmpeg environment details...', 'purple');
-            
-            try {
-                const response = await fetch('/api/diagnostics/ffmpeg-info');
-                const data = await response.json();
-                
-                if (data.success) {
-                    log(`Active Version: ${data.version}`, 'info');
-                    log('-- Full Output --');
-                    log(data.full_output);
-                } else {
-                    log('Error: ' + data.error, 'error');
-                }
-            } catch (error) {
-                log('Connection error: ' + error.message, 'error');
-            } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-            }
-        }
-        
-        async function getSystemInfo() {
-            const btn = document.getElementById('system-btn');
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> ...';
-            
-            log('Gathering system health and hardware metrics...', 'purple');
-            
-            try {
-                const response = await fetch('/api/diagnostics/system-info');
-                const data = await response.json();
-                
-                if (data.success) {
-                    log(`System Info:`, 'info');
-                    log(`  OS Platform:      ${data.platform}`);
-                    log(`  Python Version:   ${data.python_version}`);
-                    log(`  CPU Cores:        ${data.cpu_count}`);
-                    log(`  Memory Usage:     ${data.available_memory}GB available / ${data.total_memory}GB total`);
-                    log(`  Disk Usage:       ${data.disk_usage}%`);
-                    log(`  MediaMTX Version: ${data.mediamtx_version}`, 'purple');
-                    log(`  FFmpeg Version:   ${data.ffmpeg_version}`, 'purple');
+                if (error.name === 'AbortError') {
+                    log('Request cancelled.', 'warn');
                 } else {
-                    log('Error: ' + data.error, 'error');
+                    log('Connection error: ' + error.message, 'error');
                 }
-            } catch (error) {
-                log('Connection error: ' + error.message, 'error');
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
+                done();
+                endRun();
             }
         }
         
         async function getAIInfo() {
-            const btn = document.getElementById('ai-btn');
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> ...';
+            const btn = E.aiBtn;
+            const done = busy(btn, '...');
             
             log('Gathering local AI and object detection environment metrics...', 'purple');
             
@@ -1568,16 +1555,15 @@ def get_diagnostics_html(theme=''):
             } catch (error) {
                 log('Connection error: ' + error.message, 'error');
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
+                done();
+                endRun();
             }
         }
 
         // RTSP Analyzer Selection
         function handleAnalyzerCameraSelect() {
-            const select = document.getElementById('analyzer-camera-select');
-            const urlInput = document.getElementById('analyzer-stream-url');
+            const select = E.analyzerCameraSelect;
+            const urlInput = E.analyzerStreamUrl;
             if (!select.value) {
                 urlInput.value = '';
                 return;
@@ -1590,9 +1576,9 @@ def get_diagnostics_html(theme=''):
 
         // Run RTSP Analyzer
         async function runRtspAnalyzer() {
-            const select = document.getElementById('analyzer-camera-select');
-            const urlInput = document.getElementById('analyzer-stream-url');
-            const btn = document.getElementById('analyzer-btn');
+            const select = E.analyzerCameraSelect;
+            const urlInput = E.analyzerStreamUrl;
+            const btn = E.analyzerBtn;
             
             const body = {};
             if (select.value) {
@@ -1604,13 +1590,12 @@ def get_diagnostics_html(theme=''):
                 return;
             }
             
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Probing...';
+            const {signal, done} = beginRequest(btn, 'Probing...');
             log('Starting RTSP stream analysis (capturing 3 seconds)...', 'purple');
             
             try {
                 const response = await fetch('/api/diagnostics/rtsp-analyzer', {
+                    signal,
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify(body)
@@ -1636,16 +1621,19 @@ def get_diagnostics_html(theme=''):
                     pre.className = 'soap-pre';
                     pre.textContent = data.raw_stderr;
                     details.appendChild(pre);
-                    consoleEl.appendChild(details);
+                    logNode(details);
                 } else {
                     log('✗ RTSP analysis failed: ' + data.error, 'error');
                 }
             } catch (error) {
-                log('Connection error: ' + error.message, 'error');
+                if (error.name === 'AbortError') {
+                    log('Request cancelled.', 'warn');
+                } else {
+                    log('Connection error: ' + error.message, 'error');
+                }
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
+                done();
+                endRun();
             }
         }
 
@@ -1654,8 +1642,8 @@ def get_diagnostics_html(theme=''):
         let lastEventTimestamp = null;
         
         async function toggleEventPolling() {
-            const btn = document.getElementById('event-toggle-btn');
-            const resultsDiv = document.getElementById('event-stream-results');
+            const btn = E.eventToggleBtn;
+            const resultsDiv = E.eventStreamResults;
             
             if (eventPollInterval) {
                 clearInterval(eventPollInterval);
@@ -1713,7 +1701,7 @@ def get_diagnostics_html(theme=''):
         async function clearEventLogs() {
             try {
                 await fetch('/api/onvif/events/clear', {method: 'POST'});
-                document.getElementById('event-stream-results').innerHTML = '';
+                E.eventStreamResults.innerHTML = '';
                 log('ONVIF Events log cleared on server.', 'success');
             } catch (err) {
                 log('Failed to clear events log: ' + err.message, 'error');
@@ -1724,8 +1712,8 @@ def get_diagnostics_html(theme=''):
         let bandwidthInterval = null;
         
         function toggleBandwidthMonitoring() {
-            const btn = document.getElementById('bandwidth-toggle-btn');
-            const resultsDiv = document.getElementById('bandwidth-results');
+            const btn = E.bandwidthToggleBtn;
+            const resultsDiv = E.bandwidthResults;
             
             if (bandwidthInterval) {
                 clearInterval(bandwidthInterval);
@@ -1794,12 +1782,10 @@ def get_diagnostics_html(theme=''):
 
         // MediaMTX Connections
         async function refreshMediaMtxConnections() {
-            const btn = document.getElementById('mediamtx-connections-btn');
-            const resultsDiv = document.getElementById('mediamtx-connections-results');
+            const btn = E.mediamtxConnectionsBtn;
+            const resultsDiv = E.mediamtxConnectionsResults;
             
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Loading...';
+            const done = busy(btn, 'Loading...');
             
             log('Querying MediaMTX active streaming sessions...', 'purple');
             
@@ -1850,26 +1836,23 @@ def get_diagnostics_html(theme=''):
             } catch (err) {
                 log('Connection error: ' + err.message, 'error');
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
+                done();
+                endRun();
             }
         }
 
         // FFmpeg Transcode Resource Calculator
         async function runTranscodeCalculator() {
-            const camSelect = document.getElementById('transcode-camera-select');
-            const encSelect = document.getElementById('transcode-encoder');
-            const btn = document.getElementById('transcode-calc-btn');
+            const camSelect = E.transcodeCameraSelect;
+            const encSelect = E.transcodeEncoder;
+            const btn = E.transcodeCalcBtn;
             
             if (!camSelect.value) {
                 log('Error: Please select a camera to transcode.', 'error');
                 return;
             }
             
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Testing...';
+            const done = busy(btn, 'Testing...');
             
             const cameraName = camSelect.options[camSelect.selectedIndex].text;
             const encoderName = encSelect.options[encSelect.selectedIndex].text;
@@ -1905,59 +1888,354 @@ def get_diagnostics_html(theme=''):
                     pre.className = 'soap-pre';
                     pre.textContent = data.raw_stderr;
                     details.appendChild(pre);
-                    consoleEl.appendChild(details);
+                    logNode(details);
                 } else {
                     log('✗ Transcode calculator failed: ' + data.error, 'error');
                 }
             } catch (err) {
                 log('Connection error: ' + err.message, 'error');
             } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
+                done();
+                endRun();
             }
         }
 
-        // Storage I/O Check
-        async function runStorageCheck() {
-            const btn = document.getElementById('storage-check-btn');
-            
-            btn.disabled = true;
-            const originalText = btn.textContent;
-            btn.innerHTML = '<div class="spinner"></div> Benchmarking...';
-            
-            log('Starting Storage I/O Read/Write Speed Benchmark (20MB test)...', 'purple');
-            log('Benchmarking directory. Please wait a few seconds...', 'info');
-            
-            try {
-                const response = await fetch('/api/diagnostics/storage-check');
-                const data = await response.json();
-                
-                if (data.success) {
-                    log('✓ Storage benchmark complete.', 'success');
-                    log(`Storage Path: ${data.storage_path}`, 'info');
-                    log(`  • Read Speed:         ${data.read_speed_mbs} MB/s`, 'success');
-                    log(`  • Write Speed:        ${data.write_speed_mbs} MB/s`, 'success');
-                    log(`  • Performance Rating: ${data.performance_rating}`, 'purple');
-                    log(`  • Disk Space:         ${data.free_gb} GB Free / ${data.total_gb} GB Total (${data.used_percent}% used)`);
-                } else {
-                    log('✗ Storage check failed: ' + data.error, 'error');
-                }
-            } catch (err) {
-                log('Connection error: ' + err.message, 'error');
-            } finally {
-                btn.disabled = false;
-                btn.textContent = originalText;
-                log('--------------------------------------------------');
-            }
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('__DIAGNOSTICS_SW_URL__', {scope: '/diagnostics'})
+                .catch(err => console.warn('Diagnostics service worker not registered:', err));
         }
-    </script>
+'''
+
+# Service worker that keeps the diagnostics page and its assets in the
+# browser's CacheStorage. The fingerprinted assets are served cache-first;
+# the page itself is stale-while-revalidate so reloads are instant but still
+# pick up changes (e.g. a new theme) on the next load.
+_DIAGNOSTICS_SW = r'''
+const CACHE = 'diagnostics-__CACHE_VERSION__';
+const PAGE = '/diagnostics';
+const ASSETS = ['__DIAGNOSTICS_CSS_URL__', '__DIAGNOSTICS_JS_URL__'];
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(CACHE)
+            .then(cache => cache.addAll(ASSETS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // Drop caches left behind by previous releases
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => key.startsWith('diagnostics-') && key !== CACHE)
+                .map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+async function staleWhileRevalidate(event) {
+    const cache = await caches.open(CACHE);
+    const cached = await cache.match(PAGE);
+    const network = fetch(event.request).then(response => {
+        if (response.ok && !response.redirected) {
+            cache.put(PAGE, response.clone());
+        } else {
+            // Logged out (redirected to login) or erroring: stop serving the
+            // cached copy so the next load goes to the server
+            cache.delete(PAGE);
+        }
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    return network;
+}
+
+self.addEventListener('fetch', (event) => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+    if (ASSETS.includes(url.pathname + url.search)) {
+        event.respondWith(caches.match(event.request).then(hit => hit || fetch(event.request)));
+    } else if (url.pathname === PAGE) {
+        event.respondWith(staleWhileRevalidate(event));
+    }
+    // Anything else (API calls included) goes straight to the network
+});
+'''
+
+_DIAGNOSTICS_HTML = r'''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Diagnostics - Tonys Onvif-RTSP-AI Server</title>
+    <!-- Start fetching our own assets and connecting to the icon CDN before
+         the render-blocking Font Awesome stylesheet is requested -->
+    <link rel="preload" href="__DIAGNOSTICS_CSS_URL__" as="style">
+    <link rel="preload" href="__DIAGNOSTICS_JS_URL__" as="script">
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
+    <link rel="stylesheet" href="__DIAGNOSTICS_CSS_URL__">
+    <script src="__DIAGNOSTICS_JS_URL__" defer></script>
+</head>
+<body>
+    <div class="header">
+        <h1>System Diagnostics</h1>
+        <div class="header-actions">
+            <button class="clear-btn" onclick="clearConsole()">Clear Console</button>
+            <button class="back-btn" onclick="window.location.href='/'">Back to Dashboard</button>
+        </div>
+    </div>
+    
+    <div class="main-layout">
+        <div class="sidebar">
+            <!-- Tab Navigation -->
+            <div class="tab-nav">
+                <button class="tab-btn active" data-tab="discovery">
+                    <span class="tab-icon"><i class="fa-solid fa-binoculars"></i></span> Discovery
+                </button>
+                <button class="tab-btn" data-tab="network">
+                    <span class="tab-icon"><i class="fa-solid fa-network-wired"></i></span> Network
+                </button>
+                <button class="tab-btn" data-tab="camera">
+                    <span class="tab-icon"><i class="fa-solid fa-video"></i></span> Camera
+                </button>
+                <button class="tab-btn" data-tab="system">
+                    <span class="tab-icon"><i class="fa-solid fa-server"></i></span> System
+                </button>
+            </div>
+
+            <!-- ============ DISCOVERY TAB ============ -->
+            <div class="tab-panel active" id="tab-discovery">
+                <div class="tool-section">
+                    <div class="tool-title">ONVIF Camera Discovery</div>
+                    <div class="input-group">
+                        <label>Scan Timeout (seconds)</label>
+                        <select id="scan-timeout">
+                            <option value="3">3 seconds (Quick)</option>
+                            <option value="5" selected>5 seconds (Standard)</option>
+                            <option value="8">8 seconds (Thorough)</option>
+                            <option value="10">10 seconds (Deep)</option>
+                        </select>
+                    </div>
+                    <button class="btn" data-action="runOnvifScan" id="scan-btn">
+                        Scan for ONVIF Cameras
+                    </button>
+                    <div id="scan-results" style="margin-top: 15px;"></div>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">All Network Devices</div>
+                    <div class="input-group">
+                        <label>Subnet (leave empty to auto-detect)</label>
+                        <input type="text" id="net-subnet" placeholder="e.g. 192.168.1.0/24 (auto-detect)">
+                    </div>
+                    <button class="btn" data-action="runNetworkScan" id="netscan-btn">
+                        Scan All Devices
+                    </button>
+                    <div id="netscan-results" style="margin-top: 15px;"></div>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">ONVIF Event Live Stream (SOAP Logger)</div>
+                    <div style="display: flex; gap: 10px; margin-bottom: 10px;">
+                        <button class="btn" id="event-toggle-btn" data-action="toggleEventPolling">Start Live Logging</button>
+                        <button class="btn btn-secondary" data-action="clearEventLogs">Clear Logs</button>
+                    </div>
+                    <div id="event-stream-results" style="margin-top: 15px; font-family: monospace; font-size: 11px;"></div>
+                </div>
+            </div>
+
+            <!-- ============ NETWORK TAB ============ -->
+            <div class="tab-panel" id="tab-network">
+                <div class="tool-section">
+                    <div class="tool-title">Ping</div>
+                    <div class="input-group">
+                        <label>Target Host or IP</label>
+                        <input type="text" id="ping-host" placeholder="e.g. 192.168.1.100">
+                    </div>
+                    <div class="input-group">
+                        <label>Count</label>
+                        <input type="number" id="ping-count" value="4" min="1" max="10">
+                    </div>
+                    <button class="btn" data-action="ping" id="ping-btn">Run Ping</button>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">Traceroute</div>
+                    <div class="input-group">
+                        <label>Target Host or IP</label>
+                        <input type="text" id="trace-host" placeholder="e.g. example.com">
+                    </div>
+                    <button class="btn" data-action="traceroute" id="trace-btn">Run Traceroute</button>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">Port Check</div>
+                    <div class="input-group">
+                        <label>Host</label>
+                        <input type="text" id="port-host" placeholder="e.g. 192.168.1.50">
+                    </div>
+                    <div class="input-group">
+                        <label>Port</label>
+                        <input type="number" id="port-number" placeholder="554" min="1" max="65535">
+                    </div>
+                    <button class="btn" data-action="portCheck" id="port-btn">Check Port</button>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">Network Interface Bandwidth Monitor</div>
+                    <button class="btn" id="bandwidth-toggle-btn" data-action="toggleBandwidthMonitoring">Start Bandwidth Monitor</button>
+                    <div id="bandwidth-results" style="margin-top: 15px;"></div>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">MediaMTX Live Connections Monitor</div>
+                    <button class="btn" data-action="refreshMediaMtxConnections" id="mediamtx-connections-btn">Refresh Connections</button>
+                    <div id="mediamtx-connections-results" style="margin-top: 15px;"></div>
+                </div>
+            </div>
+
+            <!-- ============ CAMERA TAB ============ -->
+            <div class="tab-panel" id="tab-camera">
+                <div class="tool-section">
+                    <div class="tool-title">ONVIF Diagnostics</div>
+                    <div class="input-group">
+                        <label>Quick Select Camera</label>
+                        <select id="onvif-camera-select" onchange="handleOnvifCameraSelect()">
+                            <option value="">- Manual Input -</option>
+                        </select>
+                    </div>
+                    <div class="divider"></div>
+                    <div class="input-group">
+                        <label>Host/IP</label>
+                        <input type="text" id="onvif-host" placeholder="192.168.1.100">
+                    </div>
+                    <div class="input-group">
+                        <label>ONVIF Port</label>
+                        <input type="number" id="onvif-port" value="80" min="1" max="65535">
+                    </div>
+                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
+                        <div class="input-group">
+                            <label>Username</label>
+                            <input type="text" id="onvif-user" placeholder="admin">
+                        </div>
+                        <div class="input-group">
+                            <label>Password</label>
+                            <input type="password" id="onvif-pass" placeholder="password">
+                        </div>
+                    </div>
+                    <button class="btn" data-action="runOnvifDiag" id="onvif-btn">Run ONVIF Diag</button>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">RTSP Stream Test</div>
+                    <div class="input-group">
+                        <label>Quick Select Camera</label>
+                        <select id="camera-select" onchange="handleCameraSelect()">
+                            <option value="">- Manual Input -</option>
+                        </select>
+                    </div>
+                    <div class="input-group" id="stream-type-group" style="display: none;">
+                        <label>Stream Type</label>
+                        <select id="stream-type" onchange="handleCameraSelect()">
+                            <option value="main">Main Stream</option>
+                            <option value="sub">Sub Stream</option>
+                        </select>
+                    </div>
+                    <div class="divider"></div>
+                    <div class="input-group">
+                        <label>Host/IP & Path</label>
+                        <input type="text" id="stream-host" placeholder="192.168.1.100:554/stream">
+                    </div>
+                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
+                        <div class="input-group">
+                            <label>Username</label>
+                            <input type="text" id="stream-user" placeholder="admin">
+                        </div>
+                        <div class="input-group">
+                            <label>Password</label>
+                            <input type="password" id="stream-pass" placeholder="password">
+                        </div>
+                    </div>
+                    <button class="btn" data-action="testStream" id="stream-btn">Test Connection</button>
+                </div>
+
+                <div class="tool-section">
+                    <div class="tool-title">RTSP Latency & Jitter Analyzer</div>
+                    <div class="input-group">
+                        <label>Quick Select Camera</label>
+                        <select id="analyzer-camera-select" onchange="handleAnalyzerCameraSelect()">
+                            <option value="">- Manual Input -</option>
+                        </select>
+                    </div>
+                    <div class="input-group">
+                        <label>RTSP Stream URL</label>
+                        <input type="text" id="analyzer-stream-url" placeholder="rtsp://192.168.1.100:554/stream">
+                    </div>
+                    <button class="btn" data-action="runRtspAnalyzer" id="analyzer-btn">Run RTSP Analysis</button>
+                </div>
+            </div>
+
+            <!-- ============ SYSTEM TAB ============ -->
+            <div class="tab-panel" id="tab-system">
+                <div class="tool-section">
+                    <div class="tool-title">System Health</div>
+                    <button class="btn" data-action="systemInfo" id="system-btn">Get System Info</button>
+                </div>
+                <div class="tool-section">
+                    <div class="tool-title">FFmpeg Environment</div>
+                    <button class="btn" data-action="ffmpegInfo" id="ffmpeg-btn">Get FFmpeg Info</button>
+                </div>
+                <div class="tool-section">
+                    <div class="tool-title">Local AI Diagnostics</div>
+                    <button class="btn" data-action="getAIInfo" id="ai-btn">Get AI Info</button>
+                </div>
+                <div class="tool-section">
+                    <div class="tool-title">FFmpeg Transcode Calculator</div>
+                    <div class="input-group">
+                        <label>Select Camera</label>
+                        <select id="transcode-camera-select">
+                            <option value="">- Choose Camera -</option>
+                        </select>
+                    </div>
+                    <div class="input-group">
+                        <label>Encoder Driver</label>
+                        <select id="transcode-encoder">
+                            <option value="libx264">Software CPU (libx264)</option>
+                            <option value="h264_videotoolbox">macOS Hardware VideoToolbox (h264_videotoolbox)</option>
+                            <option value="h264_nvenc">Nvidia GPU NVENC (h264_nvenc)</option>
+                            <option value="h264_vaapi">Linux Hardware VAAPI (h264_vaapi)</option>
+                            <option value="h264_qsv">Intel QuickSync QSV (h264_qsv)</option>
+                        </select>
+                    </div>
+                    <button class="btn" data-action="runTranscodeCalculator" id="transcode-calc-btn">Run Transcode Test</button>
+                </div>
+                <div class="tool-section">
+                    <div class="tool-title">Storage I/O Performance Check</div>
+                    <button class="btn" data-action="storageCheck" id="storage-check-btn">Run Disk Benchmark</button>
+                </div>
+            </div>
+        </div>
+        
+        <div class="content">
+            <div class="output-console" id="console">
+                <div class="placeholder-text">Diagnostic output will be displayed here...</div>
+            </div>
+        </div>
+    </div>
+    
 </body>
 </html>
 '''
 
-    # Inject theme styling rules
-    themed_style = f"""
+# Inject theme styling rules
+_THEMED_STYLE = f"""
         /* Dashboard theme palette (only active when body has a theme class) */
 {APP_THEME_CSS}
         body {{
@@ -1978,7 +2256,56 @@ def get_diagnostics_html(theme=''):
             --console-bg: var(--app-input, #0d0e10);
         }}
     """
-    
-    html = html.replace('</style>', themed_style + '\n    </style>')
-    html = html.replace('<body>', f'<body class="{theme_class}">')
-    return html
+
+_DIAGNOSTICS_CSS += _THEMED_STYLE
+
+
+# The literals above stay readable for editing; only the minified form is served
+_CSS_ASSET = prebuild(minify_css(_DIAGNOSTICS_CSS))
+# Fingerprinted so the stylesheet and script can be cached indefinitely; a
+# new release changes the hash and therefore the URL.
+DIAGNOSTICS_CSS_URL = f"/diagnostics/diagnostics.css?v={_CSS_ASSET[2][:12]}"
+DIAGNOSTICS_SW_URL = "/diagnostics/sw.js"
+_JS_ASSET = prebuild(_DIAGNOSTICS_JS.replace('__DIAGNOSTICS_SW_URL__', DIAGNOSTICS_SW_URL))
+DIAGNOSTICS_JS_URL = f"/diagnostics/diagnostics.js?v={_JS_ASSET[2][:12]}"
+# The worker's cache name changes whenever either asset does, so a release
+# replaces the cached copies instead of mixing old and new files
+_SW_ASSET = prebuild(_DIAGNOSTICS_SW
+                      .replace('__CACHE_VERSION__', f"{_CSS_ASSET[2][:8]}{_JS_ASSET[2][:8]}")
+                      .replace('__DIAGNOSTICS_CSS_URL__', DIAGNOSTICS_CSS_URL)
+                      .replace('__DIAGNOSTICS_JS_URL__', DIAGNOSTICS_JS_URL))
+# The page is static apart from the <body> theme class, so it is assembled
+# once at import time and only the theme class is filled in, once per theme.
+_DIAGNOSTICS_HTML = (minify_html(_DIAGNOSTICS_HTML)
+                     .replace('__DIAGNOSTICS_CSS_URL__', DIAGNOSTICS_CSS_URL)
+                     .replace('__DIAGNOSTICS_JS_URL__', DIAGNOSTICS_JS_URL))
+
+
+@functools.lru_cache(maxsize=32)
+def get_diagnostics_html(theme=''):
+    """Return the diagnostics page for the given dashboard theme"""
+    return _DIAGNOSTICS_HTML.replace('<body>', f'<body class="{body_theme_class(theme)}">')
+
+
+@functools.lru_cache(maxsize=32)
+def get_diagnostics_page(theme=''):
+    """Return (body, gzip_body, etag) for the diagnostics page.
+
+    Encoded and compressed once per theme so requests just write out bytes.
+    """
+    return prebuild(get_diagnostics_html(theme))
+
+
+def get_diagnostics_css():
+    """Return (body, gzip_body, etag) for the diagnostics stylesheet"""
+    return _CSS_ASSET
+
+
+def get_diagnostics_js():
+    """Return (body, gzip_body, etag) for the diagnostics script"""
+    return _JS_ASSET
+
+
+def get_diagnostics_sw():
+    """Return (body, gzip_body, etag) for the diagnostics service worker"""
+    return _SW_ASSET
@@ -1,10 +1,187 @@
+import contextlib
+import hashlib
+import io
+import lzma
 import os
 import platform
 import subprocess
 import zipfile
 import shutil
+import threading
+import time
 import requests
 import re
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts for archive downloads
+DOWNLOAD_TIMEOUT = (5, 30)
+# Read/write size for archive downloads; large enough that per-chunk Python
+# overhead is negligible next to the transfer itself
+DOWNLOAD_BLOCK_SIZE = 1 << 20
+# Minimum time between download progress updates; console writes are slow
+# enough on some terminals to hold back a fast download
+PROGRESS_INTERVAL = 0.5
+# How long a resolved ffmpeg/ffprobe path is trusted before it is checked on
+# disk again
+PATH_RECHECK_INTERVAL = 30.0
+# Archives at least this big are fetched as parallel byte ranges when the
+# server supports it
+RANGED_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024
+DOWNLOAD_RANGE_PARTS = 4
+# Expected SHA-256 of downloaded archives, keyed by archive name. The
+# default URLs are rolling "release" builds whose contents change with every
+# FFmpeg release, so none are pinned here; add an entry to enforce one.
+FFMPEG_SHA256 = {}
+# Buffer used to copy executables out of an archive; the default 64 KiB
+# means thousands of read/write calls for a ~100 MB binary
+EXTRACT_COPY_BUFFER_SIZE = 4 << 20
+# Buffer tarfile reads from when Python decompresses the xz stream itself
+XZ_READ_BUFFER_SIZE = 8 << 20
+
+_download_session = None
+_download_session_lock = threading.Lock()
+
+
+def _get_download_session():
+    """Shared keep-alive session for FFmpeg downloads, created on first use"""
+    global _download_session
+    with _download_session_lock:
+        if _download_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                  max_retries=Retry(total=3, backoff_factor=0.5,
+                                                    status_forcelist=[502, 503, 504]))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _download_session = session
+        return _download_session
+
+
+def _iter_response_blocks(response, block_size):
+    """Yield a streamed response's body straight from the urllib3 response.
+    
+    Same bytes as response.iter_content(), without requests' extra generator
+    and exception-translation layers around every chunk.
+    """
+    read = response.raw.read
+    while True:
+        chunk = read(block_size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextlib.contextmanager
+def _exclusive_file_lock(path):
+    """Hold an exclusive inter-process lock on path for the with-block"""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after ~10 s; an install can take longer
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# Absolute paths, drive letters and '..' components, with either separator
+_UNSAFE_MEMBER_NAME = re.compile(r'^[\\/]|^[A-Za-z]:|(?:^|[\\/])\.\.(?:[\\/]|$)')
+
+
+def _is_safe_member_name(name):
+    """Return True if an archive member path stays inside the archive root"""
+    return not _UNSAFE_MEMBER_NAME.search(name)
+
+
+class _DownloadProgress:
+    """Prints download progress, at most every PROGRESS_INTERVAL seconds.
+    
+    Safe to share between the threads of a ranged download.
+    """
+    
+    def __init__(self, total_size):
+        self._total_size = total_size
+        self._downloaded = 0
+        self._next_print = 0.0
+        self._lock = threading.Lock()
+    
+    def add(self, count):
+        with self._lock:
+            self._downloaded += count
+            if self._total_size <= 0:
+                return
+            now = time.monotonic()
+            if now < self._next_print and self._downloaded < self._total_size:
+                return
+            self._next_print = now + PROGRESS_INTERVAL
+            percent = (self._downloaded / self._total_size) * 100
+            print(f"\r  Progress: {percent:.1f}%", end='', flush=True)
+
+
+class _ProgressReader:
+    """File-like wrapper that reports download progress as it is read.
+    
+    Also hashes everything read, so the archive can be checked without a
+    second pass over it.
+    """
+    
+    def __init__(self, raw, total_size):
+        self._raw = raw
+        self._progress = _DownloadProgress(total_size)
+        self.sha256 = hashlib.sha256()
+    
+    def read(self, size=-1):
+        chunk = self._raw.read(size)
+        self.sha256.update(chunk)
+        self._progress.add(len(chunk))
+        return chunk
+
+
+class _XzReader(io.RawIOBase):
+    """Raw stream of the data decompressed from an .xz file object.
+    
+    Output is produced at most one read's worth at a time, so nothing
+    accumulates in a growing buffer the way lzma.LZMAFile's does.
+    """
+    
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._decompressor = lzma.LZMADecompressor()
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, b):
+        d = self._decompressor
+        while not d.eof:
+            data = b''
+            if d.needs_input:
+                data = self._fileobj.read(DOWNLOAD_BLOCK_SIZE)
+                if not data:
+                    raise EOFError("Compressed archive ended before the end-of-stream marker")
+            out = d.decompress(data, max_length=len(b))
+            if out:
+                b[:len(out)] = out
+                return len(out)
+        return 0
+
 
 class FFmpegManager:
     """Manages FFmpeg/FFprobe installation"""
@@ -12,14 +189,20 @@ class FFmpegManager:
     # Minimum recommended version for full feature support
     MIN_RECOMMENDED_VERSION = (4, 0, 0)  # FFmpeg 4.0.0
     
+    # executable name -> (resolved path, time.monotonic() of last check)
+    _resolved_paths = {}
+    
     def __init__(self):
+        # Resolved once; these are consulted on every path lookup
+        self._system = platform.system().lower()
+        self._machine = platform.machine().lower()
         self.ffprobe_executable = self._get_ffprobe_name()
-        self.ffmpeg_executable = "ffmpeg.exe" if platform.system().lower() == "windows" else "ffmpeg"
+        self.ffmpeg_executable = "ffmpeg.exe" if self._system == "windows" else "ffmpeg"
         self.ffmpeg_dir = "ffmpeg"
         
     def _get_ffprobe_name(self):
         """Get the correct ffprobe executable name for the platform"""
-        system = platform.system().lower()
+        system = self._system
         if system == "windows":
             return "ffprobe.exe"
         return "ffprobe"
@@ -33,10 +216,26 @@ class FFmpegManager:
     
     def download_ffmpeg(self):
         """Download FFmpeg if not present"""
+        os.makedirs(self.ffmpeg_dir, exist_ok=True)
+        # Only one process/thread installs at a time; whoever waited for the
+        # lock re-checks first, since the holder has usually just finished
+        # the same install
+        with _exclusive_file_lock(os.path.join(self.ffmpeg_dir, '.install.lock')):
+            if self._local_binaries_present():
+                print("  FFmpeg already installed")
+                return True
+            return self._download_ffmpeg()
+    
+    def _local_binaries_present(self):
+        """True if both ffmpeg and ffprobe exist in the local FFmpeg directory"""
+        return all(os.path.isfile(os.path.join(self.ffmpeg_dir, name))
+                   for name in (self.ffmpeg_executable, self.ffprobe_executable))
+    
+    def _download_ffmpeg(self):
         print("  Downloading FFmpeg...")
         
-        system = platform.system().lower()
-        machine = platform.machine().lower()
+        system = self._system
+        machine = self._machine
         
         # Determine download URL based on platform
         if system == "windows":
@@ -87,73 +286,110 @@ class FFmpegManager:
         
         try:
             # Download with progress
-            response = requests.get(url, stream=True)
+            response = _get_download_session().get(url, stream=True, timeout=DOWNLOAD_TIMEOUT)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
-            block_size = 8192
-            downloaded = 0
-            
-            with open(archive_name, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=block_size):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        print(f"\r  Progress: {percent:.1f}%", end='', flush=True)
             
-            print("\n  Downloaded FFmpeg")
-            
-            # Extract
-            print("  Extracting...")
-            if archive_name.endswith('.zip'):
-                with zipfile.ZipFile(archive_name, 'r') as zip_ref:
-                    # Extract to temporary directory
-                    zip_ref.extractall('ffmpeg_temp')
-                
-                # Find the bin directory and move executables
+            if archive_name.endswith('.tar.xz'):
+                # tar.xz can be read in a single forward pass, so extract
+                # straight from the HTTP stream: decompression runs while the
+                # rest of the archive is still arriving
+                print("  Downloading and extracting...")
+                response.raw.decode_content = True
+                reader = _ProgressReader(response.raw, total_size)
                 os.makedirs(self.ffmpeg_dir, exist_ok=True)
+                # Members are extracted as <name>.part while streaming and only
+                # renamed into place once the whole archive's digest checks out
+                targets = [os.path.join(self.ffmpeg_dir, name)
+                           for name in (self.ffmpeg_executable, self.ffprobe_executable)]
+                try:
+                    self._extract_tar_xz_stream(reader)
+                    # tarfile stops at the end-of-archive marker; hash the rest
+                    while reader.read(DOWNLOAD_BLOCK_SIZE):
+                        pass
+                    print("\n  Downloaded FFmpeg")
+                    verified = self._check_archive_digest(archive_name, reader.sha256.hexdigest())
+                    if verified:
+                        for path in targets:
+                            if os.path.exists(path + '.part'):
+                                os.replace(path + '.part', path)
+                finally:
+                    # Unverified or interrupted: never leave staged binaries behind
+                    for path in targets:
+                        if os.path.exists(path + '.part'):
+                            os.remove(path + '.part')
+                if not verified:
+                    return False
+            else:
+                # zip keeps its index at the end of the file, so it has to be
+                # on disk before anything can be extracted
+                block_size = DOWNLOAD_BLOCK_SIZE
                 
-                for root, dirs, files in os.walk('ffmpeg_temp'):
-                    if 'bin' in root:
-                        for file in files:
-                            if file.startswith('ffprobe') or file.startswith('ffmpeg'):
-                                src = os.path.join(root, file)
-                                dst = os.path.join(self.ffmpeg_dir, file)
-                                shutil.copy2(src, dst)
-                                print(f"  Extracted {file}")
+                if (response.headers.get('accept-ranges', '').lower() == 'bytes'
+                        and total_size >= RANGED_DOWNLOAD_MIN_SIZE):
+                    # Several connections fill in the file in parallel; a
+                    # single one is often capped well below the link speed
+                    response.close()
+                    self._download_ranges(response.url, archive_name, total_size, block_size)
+                    # The ranges arrive out of order, so this one is hashed from disk
+                    sha256 = hashlib.sha256()
+                    with open(archive_name, 'rb') as f:
+                        for chunk in iter(lambda: f.read(block_size), b''):
+                            sha256.update(chunk)
+                else:
+                    progress = _DownloadProgress(total_size)
+                    sha256 = hashlib.sha256()
+                    with open(archive_name, 'wb', buffering=block_size) as f:
+                        for chunk in _iter_response_blocks(response, block_size):
+                            f.write(chunk)
+                            sha256.update(chunk)
+                            progress.add(len(chunk))
                 
-                # Cleanup
-                shutil.rmtree('ffmpeg_temp')
-            elif archive_name.endswith('.tar.xz'):
-                import tarfile
-                with tarfile.open(archive_name, 'r:xz') as tar_ref:
-                    tar_ref.extractall('ffmpeg_temp')
+                print("\n  Downloaded FFmpeg")
+                if not self._check_archive_digest(archive_name, sha256.hexdigest()):
+                    os.remove(archive_name)
+                    return False
                 
+                print("  Extracting...")
                 os.makedirs(self.ffmpeg_dir, exist_ok=True)
-                for root, dirs, files in os.walk('ffmpeg_temp'):
-                    for file in files:
-                        if file == 'ffprobe' or file == 'ffmpeg':
-                            src = os.path.join(root, file)
-                            dst = os.path.join(self.ffmpeg_dir, file)
-                            shutil.copy2(src, dst)
-                            # Make executable
-                            os.chmod(dst, 0o755)
-                            print(f"  Extracted {file}")
+                members = []
+                with zipfile.ZipFile(archive_name, 'r') as zip_ref:
+                    # Pull the executables straight out of bin/ instead of
+                    # unpacking the whole build (docs, presets, ...) first.
+                    # The archive's own index is enough to find them.
+                    wanted = (self.ffmpeg_executable, self.ffprobe_executable)
+                    for info in zip_ref.infolist():
+                        directory, _, file = info.filename.rpartition('/')
+                        if file not in wanted or directory.rpartition('/')[2] != 'bin':
+                            continue
+                        # Checked as we go; there is no separate pre-scan
+                        if not _is_safe_member_name(info.filename):
+                            print(f"  Skipping unsafe archive entry: {info.filename}")
+                            continue
+                        members.append(info)
+                
+                if members:
+                    # Each member inflates independently (zlib drops the GIL)
+                    with ThreadPoolExecutor(max_workers=len(members)) as executor:
+                        # list() re-raises the first failed member
+                        list(executor.map(lambda info: self._extract_zip_member(archive_name, info),
+                                          members))
                 
-                shutil.rmtree('ffmpeg_temp')
+                # Cleanup
+                os.remove(archive_name)
             
             print("  Extracted FFmpeg")
             
-            # Cleanup archive
-            os.remove(archive_name)
-            
             # Verify extraction
             ffprobe_path = os.path.join(self.ffmpeg_dir, self.ffprobe_executable)
             if not os.path.exists(ffprobe_path):
                 print(f"  FFprobe not found after extraction: {ffprobe_path}")
                 return False
             
+            # Fresh binaries: resolve paths again on next use
+            FFmpegManager._resolved_paths.clear()
+            
             print(f"  FFmpeg ready: {self.ffmpeg_dir}")
             return True
             
@@ -166,9 +402,177 @@ class FFmpegManager:
             traceback.print_exc()
             return False
     
+    def _check_archive_digest(self, archive_name, digest):
+        """Report the archive's SHA-256 and check it against FFMPEG_SHA256"""
+        print(f"  SHA-256: {digest}")
+        expected = FFMPEG_SHA256.get(archive_name)
+        if expected and expected.lower() != digest:
+            print(f"  Checksum mismatch for {archive_name}, expected {expected}")
+            return False
+        return True
+    
+    def _download_ranges(self, url, dest, total_size, block_size):
+        """Download url into dest using parallel HTTP Range requests.
+        
+        The file is preallocated and each worker writes its own slice, so
+        no reassembly step is needed.
+        """
+        session = _get_download_session()
+        part_size = -(-total_size // DOWNLOAD_RANGE_PARTS)
+        progress = _DownloadProgress(total_size)
+        
+        with open(dest, 'wb') as f:
+            f.truncate(total_size)
+        
+        def fetch(start):
+            end = min(start + part_size, total_size) - 1
+            response = session.get(url, headers={'Range': f'bytes={start}-{end}'},
+                                   stream=True, timeout=DOWNLOAD_TIMEOUT)
+            with response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise IOError(f"Server ignored range request (HTTP {response.status_code})")
+                received = 0
+                with open(dest, 'r+b', buffering=block_size) as f:
+                    f.seek(start)
+                    for chunk in _iter_response_blocks(response, block_size):
+                        f.write(chunk)
+                        received += len(chunk)
+                        progress.add(len(chunk))
+            if received != end - start + 1:
+                raise IOError(f"Incomplete range {start}-{end}: got {received} bytes")
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_RANGE_PARTS) as executor:
+            # list() re-raises the first failed range
+            list(executor.map(fetch, range(0, total_size, part_size)))
+    
+    def _write_executable(self, src, file, mode=None, replace=True):
+        """Copy an archive member's file object into the FFmpeg directory.
+        
+        Written next to the target and renamed into place, so an interrupted
+        install never leaves a truncated binary under the real name. A mode,
+        if given, is applied when the file is created rather than afterwards.
+        With replace=False the file is left as <file>.part for the caller to
+        move into place.
+        """
+        dst = os.path.join(self.ffmpeg_dir, file)
+        tmp = dst + '.part'
+        opener = None
+        if mode is not None:
+            opener = lambda path, flags: os.open(path, flags, mode)
+        try:
+            with open(tmp, 'wb', opener=opener) as f:
+                # A leftover .part keeps its old mode, and the umask may
+                # strip bits, so only fix it up when it isn't executable
+                if mode is not None and not os.fstat(f.fileno()).st_mode & 0o100:
+                    os.chmod(tmp, mode)
+                shutil.copyfileobj(src, f, EXTRACT_COPY_BUFFER_SIZE)
+            if replace:
+                os.replace(tmp, dst)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        print(f"  Extracted {file}")
+    
+    def _extract_zip_member(self, archive_name, info):
+        """Write one executable out of a zip archive.
+        
+        Opens its own ZipFile so several members can be extracted from
+        different threads at once.
+        """
+        with zipfile.ZipFile(archive_name, 'r') as zip_ref:
+            with zip_ref.open(info) as src:
+                self._write_executable(src, info.filename.rpartition('/')[2])
+    
+    def _extract_tar_executables(self, tar_ref):
+        """Write ffmpeg/ffprobe from a streaming tarfile, skipping the rest.
+        
+        They are left as .part files: the archive can't be verified until it
+        has been read to the end.
+        """
+        import tarfile
+        
+        # tarfile's own 'data' extraction filter (Python 3.12+ and recent
+        # security releases); it also drops setuid and group/other write bits
+        data_filter = getattr(tarfile, 'data_filter', None)
+        for member in tar_ref:
+            file = member.name.rpartition('/')[2]
+            if file not in ('ffmpeg', 'ffprobe') or not member.isfile():
+                continue
+            # Validated member by member during the single streaming pass;
+            # a streamed tar can't be listed up front without decompressing it twice
+            if not _is_safe_member_name(member.name):
+                print(f"  Skipping unsafe archive entry: {member.name}")
+                continue
+            if data_filter is not None:
+                try:
+                    member = data_filter(member, self.ffmpeg_dir)
+                except tarfile.FilterError as e:
+                    print(f"  Skipping unsafe archive entry: {member.name} ({e})")
+                    continue
+            # Keep the entry's own permissions when they are already executable
+            mode = member.mode if member.mode & 0o111 else 0o755
+            self._write_executable(tar_ref.extractfile(member), file, mode, replace=False)
+    
+    def _extract_tar_xz_stream(self, fileobj):
+        """Extract ffmpeg/ffprobe from a .tar.xz read from fileobj in one pass.
+        
+        When the xz tool is installed it does the decompression in its own
+        process (multi-threaded with xz 5.4+), so it runs in parallel with
+        the download and with tarfile writing members out. Otherwise Python's
+        lzma module decompresses it block by block.
+        """
+        import tarfile
+        
+        xz = shutil.which('xz')
+        if not xz:
+            reader = io.BufferedReader(_XzReader(fileobj), buffer_size=XZ_READ_BUFFER_SIZE)
+            with tarfile.open(fileobj=reader, mode='r|') as tar_ref:
+                self._extract_tar_executables(tar_ref)
+            return
+        
+        proc = subprocess.Popen([xz, '-dc', '-T0'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        feed_errors = []
+        
+        def feed():
+            try:
+                while True:
+                    chunk = fileobj.read(DOWNLOAD_BLOCK_SIZE)
+                    if not chunk:
+                        break
+                    proc.stdin.write(chunk)
+            except BrokenPipeError:
+                pass  # xz exited early; its status is checked below
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+        
+        feeder = threading.Thread(target=feed, name='ffmpeg-xz-feed', daemon=True)
+        feeder.start()
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode='r|') as tar_ref:
+                self._extract_tar_executables(tar_ref)
+            # Drain the end-of-archive padding so xz can exit cleanly
+            while proc.stdout.read(1 << 16):
+                pass
+        finally:
+            proc.stdout.close()
+            feeder.join()
+            proc.wait()
+        
+        if feed_errors:
+            raise feed_errors[0]
+        if proc.returncode != 0:
+            raise RuntimeError(f"xz exited with status {proc.returncode}")
+    
     def install_system_ffmpeg(self):
         """Install FFmpeg using system package manager (Linux only)"""
-        if platform.system().lower() != "linux":
+        if self._system != "linux":
             return False
             
         print("  Attempting to install FFmpeg via system package manager...")
@@ -300,7 +704,7 @@ class FFmpegManager:
             print("Please install FFmpeg manually:")
             print("")
             
-            system = platform.system().lower()
+            system = self._system
             if system == "linux":
                 print("  sudo apt update && sudo apt install -y ffmpeg")
             elif system == "darwin":
@@ -331,7 +735,7 @@ class FFmpegManager:
         print("  - Hardware encoding")
         print("")
         
-        system = platform.system().lower()
+        system = self._system
         
         if system == "linux":
             print("Would you like to upgrade FFmpeg now?")
@@ -405,8 +809,8 @@ class FFmpegManager:
 
     def _find_ffmpeg_binary(self):
         """Locate ffmpeg binary with multiple fallbacks"""
-        system = platform.system().lower()
-        executable = "ffmpeg.exe" if system == "windows" else "ffmpeg"
+        system = self._system
+        executable = self.ffmpeg_executable
         
         # 1. Check system path
         path = shutil.which(executable)
@@ -442,9 +846,37 @@ class FFmpegManager:
                     
         return None
 
+    def _get_cached_path(self, executable, resolve):
+        """Return a resolved binary path, re-resolving only when needed.
+        
+        Lookups are shared by all instances (the manager is created per
+        request in several places). A cached path is re-checked on disk at
+        most every PATH_RECHECK_INTERVAL seconds; fallback names that don't
+        point at a real file are never cached.
+        """
+        now = time.monotonic()
+        entry = FFmpegManager._resolved_paths.get(executable)
+        if entry is not None:
+            path, checked_at = entry
+            if now - checked_at < PATH_RECHECK_INTERVAL:
+                return path
+            if os.path.isfile(path):
+                FFmpegManager._resolved_paths[executable] = (path, now)
+                return path
+            FFmpegManager._resolved_paths.pop(executable, None)
+        
+        path = resolve()
+        if path and os.path.isfile(path):
+            FFmpegManager._resolved_paths[executable] = (path, now)
+        return path
+    
     def get_ffmpeg_path(self):
         """Get the path to ffmpeg"""
-        system = platform.system().lower()
+        return self._get_cached_path(self.ffmpeg_executable, self._resolve_ffmpeg_path)
+    
+    def _resolve_ffmpeg_path(self):
+        """Locate ffmpeg, installing or downloading it if necessary"""
+        system = self._system
         
         # Linux/macOS: Prioritize existing FFmpeg (system path or local)
         if system in ["linux", "darwin"]:
@@ -465,7 +897,7 @@ class FFmpegManager:
                 return "ffmpeg" # Return default and let it fail
             
         # Windows/macOS Fallback: Use dedicated local FFmpeg
-        executable = "ffmpeg.exe" if system == "windows" else "ffmpeg"
+        executable = self.ffmpeg_executable
         
         # 1. Check local directory (dedicated copy for this application)
         local_path = os.path.join(self.ffmpeg_dir, executable)
@@ -488,8 +920,8 @@ class FFmpegManager:
 
     def _find_ffprobe_binary(self):
         """Locate ffprobe binary with multiple fallbacks"""
-        system = platform.system().lower()
-        executable = "ffprobe.exe" if system == "windows" else "ffprobe"
+        system = self._system
+        executable = self.ffprobe_executable
         
         # 1. Check system path
         path = shutil.which(executable)
@@ -527,7 +959,11 @@ class FFmpegManager:
 
     def get_ffprobe_path(self):
         """Get the path to ffprobe"""
-        system = platform.system().lower()
+        return self._get_cached_path(self.ffprobe_executable, self._resolve_ffprobe_path)
+    
+    def _resolve_ffprobe_path(self):
+        """Locate ffprobe, installing or downloading it if necessary"""
+        system = self._system
         
         # Linux/macOS: Check system path or local
         if system in ["linux", "darwin"]:
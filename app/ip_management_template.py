@@ -1,21 +1,15 @@
 """
 IP Management and Whitelisting template
 """
+import functools
+import json
 
+from .page_assets import minify_css, minify_html, prebuild
 from .theme_css import APP_THEME_CSS, body_theme_class
 
-def get_ip_management_html(whitelist, theme=''):
-    theme_class = body_theme_class(theme)
-    return f'''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>IP Management - Tonys Onvif-RTSP-AI Server</title>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-    <style>
-        :root {{
+# The stylesheet and script are served as separate long-cached assets
+_IP_MANAGEMENT_CSS = r'''
+        :root {
             --bg-color: #282a36;
             --sidebar-bg: #1e1f29;
             --card-bg: #343746;
@@ -31,11 +25,11 @@ def get_ip_management_html(whitelist, theme=''):
             --border-color: #44475a;
             --input-bg: #282a36;
             --table-header: #44475a;
-        }}
+        }
 
         /* Dashboard theme palette (only active when body has a theme class) */
-{APP_THEME_CSS}
-        body {{
+__APP_THEME_CSS__
+        body {
             --bg-color: var(--app-bg, #282a36);
             --sidebar-bg: var(--app-header, #1e1f29);
             --card-bg: var(--app-card, #343746);
@@ -50,15 +44,15 @@ def get_ip_management_html(whitelist, theme=''):
             --border-color: var(--app-border, #44475a);
             --input-bg: var(--app-input, #282a36);
             --table-header: var(--app-border, #44475a);
-        }}
+        }
 
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             background-color: var(--bg-color);
             color: var(--text-main);
@@ -66,9 +60,9 @@ def get_ip_management_html(whitelist, theme=''):
             display: flex;
             flex-direction: column;
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: var(--header-bg);
             padding: 15px 30px;
             display: flex;
@@ -76,24 +70,24 @@ def get_ip_management_html(whitelist, theme=''):
             align-items: center;
             border-bottom: 1px solid var(--border-color);
             flex-shrink: 0;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             color: var(--accent-purple);
             font-size: 20px;
             font-weight: 700;
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
+        }
         
-        .header-actions {{
+        .header-actions {
             display: flex;
             gap: 12px;
             align-items: center;
-        }}
+        }
 
-        .back-btn {{
+        .back-btn {
             background: transparent;
             color: var(--accent-purple);
             border: 1.5px solid var(--accent-purple);
@@ -107,20 +101,20 @@ def get_ip_management_html(whitelist, theme=''):
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
         
-        .back-btn:hover {{
+        .back-btn:hover {
             background: color-mix(in srgb, var(--accent-purple) 14%, transparent);
             transform: translateY(-1px);
-        }}
+        }
 
-        .main-layout {{
+        .main-layout {
             display: flex;
             flex: 1;
             overflow: hidden;
-        }}
+        }
         
-        .sidebar {{
+        .sidebar {
             width: 350px;
             background: var(--sidebar-bg);
             border-right: 1px solid var(--border-color);
@@ -130,16 +124,16 @@ def get_ip_management_html(whitelist, theme=''):
             display: flex;
             flex-direction: column;
             gap: 20px;
-        }}
+        }
         
-        .content {{
+        .content {
             flex: 1;
             padding: 30px;
             overflow-y: auto;
             background: var(--bg-color);
-        }}
+        }
 
-        .section-title {{
+        .section-title {
             font-size: 14px;
             font-weight: 700;
             color: var(--accent-cyan);
@@ -149,29 +143,29 @@ def get_ip_management_html(whitelist, theme=''):
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
 
-        .card {{
+        .card {
             background: var(--card-bg);
             border-radius: 10px;
             padding: 20px;
             border: 1px solid var(--border-color);
             margin-bottom: 20px;
-        }}
+        }
 
-        .input-group {{
+        .input-group {
             margin-bottom: 15px;
-        }}
+        }
         
-        .input-group label {{
+        .input-group label {
             display: block;
             margin-bottom: 6px;
             font-weight: 600;
             color: var(--text-muted);
             font-size: 12px;
-        }}
+        }
         
-        .input-group input {{
+        .input-group input {
             width: 100%;
             padding: 10px 12px;
             border: 1px solid var(--border-color);
@@ -180,14 +174,14 @@ def get_ip_management_html(whitelist, theme=''):
             border-radius: 6px;
             font-size: 14px;
             transition: all 0.2s;
-        }}
+        }
         
-        .input-group input:focus {{
+        .input-group input:focus {
             outline: none;
             border-color: var(--accent-purple);
-        }}
+        }
         
-        .btn {{
+        .btn {
             background: transparent;
             color: var(--accent-purple);
             border: 1.5px solid var(--accent-purple);
@@ -202,29 +196,29 @@ def get_ip_management_html(whitelist, theme=''):
             align-items: center;
             justify-content: center;
             gap: 8px;
-        }}
+        }
 
-        .btn:hover {{
+        .btn:hover {
             background: color-mix(in srgb, var(--accent-purple) 14%, transparent);
             transform: translateY(-1px);
-        }}
+        }
 
-        .btn-success {{
+        .btn-success {
             background: transparent;
             color: var(--accent-green);
             border-color: var(--accent-green);
-        }}
-        .btn-success:hover {{ background: color-mix(in srgb, var(--accent-green) 14%, transparent); }}
+        }
+        .btn-success:hover { background: color-mix(in srgb, var(--accent-green) 14%, transparent); }
 
-        .btn-danger {{
+        .btn-danger {
             background: transparent;
             color: var(--accent-red);
             border-color: var(--accent-red);
-        }}
-        .btn-danger:hover {{ background: color-mix(in srgb, var(--accent-red) 14%, transparent); }}
+        }
+        .btn-danger:hover { background: color-mix(in srgb, var(--accent-red) 14%, transparent); }
 
         /* Sessions List */
-        .session-item {{
+        .session-item {
             background: rgba(0,0,0,0.2);
             border-radius: 8px;
             padding: 12px;
@@ -232,26 +226,26 @@ def get_ip_management_html(whitelist, theme=''):
             font-size: 13px;
             border: 1px solid transparent;
             transition: border-color 0.2s;
-        }}
+        }
         
-        .session-item:hover {{
+        .session-item:hover {
             border-color: var(--accent-purple);
-        }}
+        }
 
-        .session-header {{
+        .session-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 8px;
-        }}
+        }
 
-        .session-ip {{
+        .session-ip {
             font-weight: 700;
             color: var(--accent-cyan);
             font-family: monospace;
-        }}
+        }
 
-        .session-badge {{
+        .session-badge {
             font-size: 10px;
             padding: 2px 6px;
             border-radius: 4px;
@@ -260,32 +254,32 @@ def get_ip_management_html(whitelist, theme=''):
             border: 1px solid var(--accent-purple);
             font-weight: 700;
             text-transform: uppercase;
-        }}
+        }
 
-        .session-badge.whitelisted {{
+        .session-badge.whitelisted {
             background: transparent;
             color: var(--accent-green);
             border-color: var(--accent-green);
-        }}
+        }
 
-        .session-info {{
+        .session-info {
             color: var(--text-muted);
             font-size: 12px;
-        }}
+        }
 
-        .session-path {{
+        .session-path {
             color: var(--accent-pink);
             font-family: monospace;
-        }}
+        }
 
         /* Table Styles */
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 10px;
-        }}
+        }
 
-        th {{
+        th {
             text-align: left;
             padding: 12px 15px;
             background: var(--table-header);
@@ -294,34 +288,43 @@ def get_ip_management_html(whitelist, theme=''):
             text-transform: uppercase;
             letter-spacing: 1px;
             border-bottom: 2px solid var(--border-color);
-        }}
+        }
 
-        td {{
+        td {
             padding: 15px;
             border-bottom: 1px solid var(--border-color);
             font-size: 14px;
-        }}
+        }
 
-        tr:hover {{
+        tr:hover {
             background: rgba(255,255,255,0.02);
-        }}
+        }
+
+        .wl-spacer td {
+            padding: 0;
+            border: 0;
+        }
 
-        .ip-cell {{
+        tr.wl-spacer:hover {
+            background: none;
+        }
+
+        .ip-cell {
             font-family: 'Consolas', monospace;
             color: var(--accent-cyan);
             font-weight: 600;
-        }}
+        }
 
-        .cidr-badge {{
+        .cidr-badge {
             font-size: 11px;
             padding: 2px 6px;
             border-radius: 4px;
             background: rgba(139, 233, 253, 0.1);
             color: var(--accent-cyan);
             border: 1px solid rgba(139, 233, 253, 0.2);
-        }}
+        }
 
-        .action-btn {{
+        .action-btn {
             background: transparent;
             border: 1px solid var(--border-color);
             color: var(--text-muted);
@@ -333,22 +336,22 @@ def get_ip_management_html(whitelist, theme=''):
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
+        }
 
-        .action-btn:hover {{
+        .action-btn:hover {
             border-color: var(--accent-red);
             color: var(--accent-red);
             background: rgba(255, 85, 85, 0.1);
-        }}
+        }
 
-        .empty-table {{
+        .empty-table {
             text-align: center;
             padding: 40px;
             color: var(--text-muted);
             font-style: italic;
-        }}
+        }
 
-        .badge-new {{
+        .badge-new {
             background: var(--accent-green);
             color: #282a36;
             font-size: 10px;
@@ -356,9 +359,9 @@ def get_ip_management_html(whitelist, theme=''):
             border-radius: 3px;
             margin-left: 5px;
             vertical-align: middle;
-        }}
+        }
         
-        .loading-overlay {{
+        .loading-overlay {
             position: fixed;
             top: 0; left: 0; width: 100%; height: 100%;
             background: rgba(40, 42, 54, 0.5);
@@ -366,42 +369,429 @@ def get_ip_management_html(whitelist, theme=''):
             align-items: center;
             justify-content: center;
             z-index: 1000;
-        }}
+        }
 
-        .spinner {{
+        .spinner {
             width: 40px;
             height: 40px;
             border: 4px solid rgba(189, 147, 249, 0.2);
             border-top: 4px solid var(--accent-purple);
             border-radius: 50%;
             animation: spin 1s linear infinite;
-        }}
+        }
+
+        .icon {
+            width: 1em;
+            height: 1em;
+            vertical-align: -0.125em;
+            fill: none;
+            stroke: currentColor;
+            stroke-width: 2;
+            stroke-linecap: round;
+            stroke-linejoin: round;
+        }
+
+        .icon-2x {
+            font-size: 2em;
+        }
+
+        .icon-spin {
+            animation: spin 1s linear infinite;
+        }
 
-        @keyframes spin {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
 
         /* Horizontal active-sessions layout */
-        .sessions-grid {{
+        .sessions-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(260px, 1fr));
             gap: 12px;
-        }}
-        .sessions-grid .session-item {{ margin-bottom: 0; }}
-        .sessions-msg {{
+        }
+        .sessions-grid .session-item { margin-bottom: 0; }
+        .sessions-msg {
             grid-column: 1 / -1;
             text-align: center;
             color: var(--text-muted);
             padding: 30px;
-        }}
-    </style>
+        }
+'''
+
+_IP_MANAGEMENT_JS = r'''
+        let currentWhitelist = window.currentWhitelist || [];
+
+        // Entries arrive as {ip, cidr}; ip -> its table row, for the rows currently in the DOM
+        let rowByEntry = new Map();
+
+        // Parsed once by the browser; each row is a clone of it
+        const whitelistRowTemplate = document.getElementById('wl-row').content;
+
+        function buildWhitelistRow({ ip, cidr }) {
+            const tr = whitelistRowTemplate.firstElementChild.cloneNode(true);
+            tr.querySelector('.cidr-badge').textContent = cidr ? 'CIDR Block' : 'Single IP';
+            tr.querySelector('.ip-cell').textContent = ip;
+            tr.querySelector('button').addEventListener('click', () => removeFromWhitelist(ip));
+            return tr;
+        }
+
+        // The table is virtualized: only the rows within the scrolled view (plus
+        // some overscan) exist, and spacer rows stand in for the rest, so the
+        // DOM stays the same size however long the whitelist gets
+        const WHITELIST_OVERSCAN = 10;
+        const whitelistScroller = document.querySelector('.content');
+        const topSpacer = buildSpacerRow();
+        const bottomSpacer = buildSpacerRow();
+        let whitelistRowHeight = 52;
+        let rowHeightMeasured = false;
+        let windowStart = -1;
+        let windowEnd = -1;
+        let windowFrame = 0;
+
+        function buildSpacerRow() {
+            const tr = document.createElement('tr');
+            tr.className = 'wl-spacer';
+            const td = document.createElement('td');
+            td.colSpan = 3;
+            tr.appendChild(td);
+            return tr;
+        }
+
+        function renderWhitelist() {
+            windowStart = windowEnd = -1;
+            updateWhitelistWindow();
+        }
+
+        function updateWhitelistWindow() {
+            const tbody = document.getElementById('whitelist-body');
+            const count = currentWhitelist.length;
+            // How far the top of the visible area is into the table body
+            const offset = whitelistScroller.getBoundingClientRect().top - tbody.getBoundingClientRect().top;
+            const start = Math.min(count, Math.max(0, Math.floor(offset / whitelistRowHeight) - WHITELIST_OVERSCAN));
+            const end = Math.min(count, start + Math.ceil(whitelistScroller.clientHeight / whitelistRowHeight)
+                                        + 2 * WHITELIST_OVERSCAN);
+            if (start === windowStart && end === windowEnd) return;
+            windowStart = start;
+            windowEnd = end;
+
+            // Rows still in the window are reused; the rest are dropped
+            const visible = new Map();
+            for (let i = start; i < end; i++) {
+                const entry = currentWhitelist[i];
+                visible.set(entry.ip, rowByEntry.get(entry.ip) || buildWhitelistRow(entry));
+            }
+            rowByEntry = visible;
+
+            topSpacer.firstChild.style.height = (start * whitelistRowHeight) + 'px';
+            bottomSpacer.firstChild.style.height = ((count - end) * whitelistRowHeight) + 'px';
+            tbody.replaceChildren(topSpacer, ...visible.values(), bottomSpacer);
+
+            if (!rowHeightMeasured && visible.size) {
+                rowHeightMeasured = true;
+                whitelistRowHeight = visible.values().next().value.getBoundingClientRect().height || whitelistRowHeight;
+                renderWhitelist();
+            }
+            document.getElementById('empty-whitelist').style.display = count ? 'none' : 'block';
+        }
+
+        function scheduleWhitelistWindow() {
+            if (!windowFrame) {
+                windowFrame = requestAnimationFrame(() => {
+                    windowFrame = 0;
+                    updateWhitelistWindow();
+                });
+            }
+        }
+
+        whitelistScroller.addEventListener('scroll', scheduleWhitelistWindow, { passive: true });
+        window.addEventListener('resize', scheduleWhitelistWindow);
+
+        // Edits made within WHITELIST_FLUSH_MS of each other go to the server
+        // as one PATCH carrying only what changed
+        const WHITELIST_FLUSH_MS = 200;
+        const pendingOps = { add: new Set(), remove: new Set() };
+        let pendingWaiters = [];
+        let flushTimer = null;
+
+        function queueWhitelistOp(op, entry) {
+            // Adding and then removing the same entry in one batch cancels out
+            const opposite = op === 'add' ? pendingOps.remove : pendingOps.add;
+            if (opposite.has(entry)) {
+                opposite.delete(entry);
+            } else {
+                pendingOps[op].add(entry);
+            }
+            clearTimeout(flushTimer);
+            flushTimer = setTimeout(flushWhitelistOps, WHITELIST_FLUSH_MS);
+            return new Promise((resolve, reject) => pendingWaiters.push({ resolve, reject }));
+        }
+
+        async function flushWhitelistOps() {
+            const body = JSON.stringify({ add: [...pendingOps.add], remove: [...pendingOps.remove] });
+            const waiters = pendingWaiters;
+            pendingOps.add.clear();
+            pendingOps.remove.clear();
+            pendingWaiters = [];
+            try {
+                const response = await fetch('/api/settings/whitelist', {
+                    method: 'PATCH',
+                    headers: { 'Content-Type': 'application/json' },
+                    body
+                });
+                const data = await response.json().catch(() => ({}));
+                waiters.forEach(w => w.resolve({ ok: response.ok, data }));
+            } catch (err) {
+                waiters.forEach(w => w.reject(err));
+            }
+        }
+
+        async function addToWhitelist() {
+            const input = document.getElementById('new-ip');
+            const ip = input.value.trim();
+            if (!ip) return;
+
+            // Simple validation
+            if (!ip.includes('.') && !ip.includes(':')) {
+                alert('Invalid IP address format');
+                return;
+            }
+            if (currentWhitelist.some(entry => entry.ip === ip)) {
+                input.value = '';
+                return;
+            }
+
+            showLoading(true);
+            try {
+                const result = await queueWhitelistOp('add', ip);
+
+                if (result.ok) {
+                    // The server's list also reflects edits made elsewhere
+                    currentWhitelist = result.data.whitelist;
+                    renderWhitelist();
+                    input.value = '';
+                } else {
+                    alert('Error: ' + (result.data.error || 'Failed to save whitelist'));
+                }
+            } catch (err) {
+                alert('Connection error: ' + err.message);
+            } finally {
+                showLoading(false);
+            }
+        }
+
+        async function removeFromWhitelist(ip) {
+            if (!confirm('Are you sure you want to remove this entry?')) return;
+
+            showLoading(true);
+            try {
+                const result = await queueWhitelistOp('remove', ip);
+
+                if (result.ok) {
+                    currentWhitelist = result.data.whitelist;
+                    renderWhitelist();
+                } else {
+                    alert('Failed to update whitelist');
+                }
+            } catch (err) {
+                alert('Connection error: ' + err.message);
+            } finally {
+                showLoading(false);
+            }
+        }
+
+        const SESSION_POLL_MS = 10000;
+        let sessionsTimer = null;
+        // Validator of the last rendered session list; a 304 means it still holds
+        let sessionsEtag = null;
+        // Raw body of the last rendered session list; an identical payload only refreshes ages
+        let sessionsText = null;
+
+        function showSessions(text) {
+            if (text === sessionsText) {
+                updateSessionAges();
+                return;
+            }
+            renderSessions(JSON.parse(text));
+            sessionsText = text;
+        }
+
+        async function refreshSessions() {
+            const list = document.getElementById('sessions-list');
+            try {
+                const response = await fetch('/api/sessions', {
+                    cache: 'no-store',
+                    headers: sessionsEtag ? { 'If-None-Match': sessionsEtag } : {}
+                });
+                if (response.status === 304) {
+                    updateSessionAges();
+                    return;
+                }
+                showSessions(await response.text());
+                sessionsEtag = response.headers.get('ETag');
+            } catch (err) {
+                sessionsEtag = null;
+                sessionsText = null;
+                list.innerHTML = '<div class="sessions-msg" style="color: var(--accent-red);">Failed to load sessions.</div>';
+            }
+        }
+
+        function renderSessions(sessions) {
+            const list = document.getElementById('sessions-list');
+            // A pushed list may differ from what the last ETag described
+            sessionsEtag = null;
+
+            if (sessions.length === 0) {
+                list.innerHTML = '<div class="sessions-msg">No active connections.</div>';
+                return;
+            }
+
+            // Entries are set as text, never parsed as markup
+            const fragment = document.createDocumentFragment();
+            sessions.forEach(s => fragment.appendChild(buildSessionItem(s)));
+            list.replaceChildren(fragment);
+        }
+
+        const sessionItemTemplate = document.getElementById('session-item').content;
+
+        function buildSessionItem(s) {
+            const item = sessionItemTemplate.firstElementChild.cloneNode(true);
+            item.querySelector('.session-ip').textContent = s.cleanIp;
+
+            const badge = item.querySelector('.session-badge');
+            if (s.whitelisted) {
+                badge.classList.add('whitelisted');
+                badge.querySelector('.session-status').textContent = 'Whitelisted';
+            } else {
+                badge.querySelector('.icon').remove();
+                badge.querySelector('.session-status').textContent = 'Authenticated';
+            }
+
+            item.querySelector('.session-path').textContent = '/' + s.path;
+            item.querySelector('.session-protocol').textContent = s.protocol;
+            const age = item.querySelector('.session-age');
+            age.dataset.created = s.created;
+            age.textContent = getRelativeTime(s.created);
+
+            const button = item.querySelector('button');
+            if (s.whitelisted) {
+                button.remove();
+            } else {
+                button.addEventListener('click', () => quickWhitelist(s.cleanIp));
+            }
+            return item;
+        }
+
+        function updateSessionAges() {
+            document.querySelectorAll('#sessions-list .session-age').forEach(el => {
+                el.textContent = getRelativeTime(el.dataset.created);
+            });
+        }
+
+        // Polls only while the tab is visible; coming back refreshes at once
+        async function pollSessions() {
+            clearTimeout(sessionsTimer);
+            await refreshSessions();
+            sessionsTimer = document.visibilityState === 'visible'
+                ? setTimeout(pollSessions, SESSION_POLL_MS)
+                : null;
+        }
+
+        // The server pushes the session list whenever it changes; polling is
+        // only the fallback when the stream can't be used
+        let sessionStream = null;
+
+        function startSessionUpdates() {
+            if (!window.EventSource) {
+                pollSessions();
+                return;
+            }
+            sessionStream = new EventSource('/api/sessions/stream');
+            sessionStream.onmessage = ev => showSessions(ev.data);
+            sessionStream.onerror = () => {
+                // CLOSED means the browser gave up reconnecting (e.g. the login expired)
+                if (sessionStream && sessionStream.readyState === EventSource.CLOSED) {
+                    sessionStream = null;
+                    pollSessions();
+                }
+            };
+        }
+
+        function stopSessionUpdates() {
+            if (sessionStream) {
+                sessionStream.close();
+                sessionStream = null;
+            }
+            clearTimeout(sessionsTimer);
+            sessionsTimer = null;
+        }
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'visible') {
+                startSessionUpdates();
+            } else {
+                stopSessionUpdates();
+            }
+        });
+
+        async function quickWhitelist(ip) {
+            const input = document.getElementById('new-ip');
+            input.value = ip;
+            addToWhitelist();
+        }
+
+        function getRelativeTime(timestamp) {
+            const date = new Date(timestamp);
+            const now = new Date();
+            const elapsed = Math.floor((now - date) / 1000);
+            
+            if (elapsed < 60) return 'Just now';
+            if (elapsed < 3600) return Math.floor(elapsed / 60) + 'm ago';
+            return Math.floor(elapsed / 3600) + 'h ago';
+        }
+
+        function showLoading(show) {
+            document.getElementById('loading').style.display = show ? 'flex' : 'none';
+        }
+
+        // Initial load
+        renderWhitelist();
+        if (document.visibilityState === 'visible') startSessionUpdates();
+        // Ages move on even while the list itself doesn't change
+        setInterval(updateSessionAges, 30000);
+'''
+
+# Only the <body> theme class and the whitelist change between requests, so
+# the page is assembled once at import time and those two are filled in.
+_IP_MANAGEMENT_HTML = r'''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>IP Management - Tonys Onvif-RTSP-AI Server</title>
+    <link rel="stylesheet" href="__IP_MANAGEMENT_CSS_URL__">
 </head>
-<body class="{theme_class}">
+<body>
+    <!-- Icon sprite: each icon is drawn with <svg class="icon"><use href="#i-name"/></svg> -->
+    <svg xmlns="http://www.w3.org/2000/svg" style="display: none;">
+        <symbol id="i-shield" viewBox="0 0 24 24"><path d="M12 22s8-4 8-10V5l-8-3-8 3v7c0 6 8 10 8 10z"/></symbol>
+        <symbol id="i-arrow-left" viewBox="0 0 24 24"><path d="M19 12H5M12 19l-7-7 7-7"/></symbol>
+        <symbol id="i-plus-circle" viewBox="0 0 24 24"><circle cx="12" cy="12" r="10"/><path d="M12 8v8M8 12h8"/></symbol>
+        <symbol id="i-plus" viewBox="0 0 24 24"><path d="M12 5v14M5 12h14"/></symbol>
+        <symbol id="i-list" viewBox="0 0 24 24"><path d="M8 6h13M8 12h13M8 18h13M3 6h.01M3 12h.01M3 18h.01"/></symbol>
+        <symbol id="i-trash" viewBox="0 0 24 24"><path d="M3 6h18M19 6l-1 14a2 2 0 0 1-2 2H8a2 2 0 0 1-2-2L5 6M10 11v6M14 11v6M9 6V4a1 1 0 0 1 1-1h4a1 1 0 0 1 1 1v2"/></symbol>
+        <symbol id="i-redo" viewBox="0 0 24 24"><path d="M23 4v6h-6"/><path d="M20.49 15a9 9 0 1 1-2.12-9.36L23 10"/></symbol>
+        <symbol id="i-info" viewBox="0 0 24 24"><circle cx="12" cy="12" r="10"/><path d="M12 16v-4M12 8h.01"/></symbol>
+        <symbol id="i-broadcast" viewBox="0 0 24 24"><circle cx="12" cy="12" r="2"/><path d="M16.24 7.76a6 6 0 0 1 0 8.49M7.76 16.24a6 6 0 0 1 0-8.49M19.07 4.93a10 10 0 0 1 0 14.14M4.93 19.07a10 10 0 0 1 0-14.14"/></symbol>
+        <symbol id="i-refresh" viewBox="0 0 24 24"><path d="M23 4v6h-6M1 20v-6h6"/><path d="M3.51 9a9 9 0 0 1 14.85-3.36L23 10M1 14l4.64 4.36A9 9 0 0 0 20.49 15"/></symbol>
+        <symbol id="i-spinner" viewBox="0 0 24 24"><path d="M21 12a9 9 0 1 1-6.22-8.56"/></symbol>
+        <symbol id="i-check" viewBox="0 0 24 24"><path d="M20 6L9 17l-5-5"/></symbol>
+    </svg>
     <div class="header">
-        <h1><i class="fas fa-shield-network"></i> IP Management & Whitelisting</h1>
+        <h1><svg class="icon"><use href="#i-shield"/></svg> IP Management & Whitelisting</h1>
         <div class="header-actions">
-            <a href="/" class="back-btn"><i class="fas fa-arrow-left"></i> Back to Dashboard</a>
+            <a href="/" class="back-btn"><svg class="icon"><use href="#i-arrow-left"/></svg> Back to Dashboard</a>
         </div>
     </div>
     
@@ -409,7 +799,7 @@ def get_ip_management_html(whitelist, theme=''):
         <div class="sidebar">
             <!-- Add to Whitelist -->
             <div class="tool-section">
-                <div class="section-title"><i class="fas fa-plus-circle"></i> Add to Whitelist</div>
+                <div class="section-title"><svg class="icon"><use href="#i-plus-circle"/></svg> Add to Whitelist</div>
                 <div class="card">
                     <div class="input-group">
                         <label>IP Address or CIDR Range</label>
@@ -419,14 +809,14 @@ def get_ip_management_html(whitelist, theme=''):
                         </small>
                     </div>
                     <button class="btn btn-success" onclick="addToWhitelist()">
-                        <i class="fas fa-plus"></i> Add Entry
+                        <svg class="icon"><use href="#i-plus"/></svg> Add Entry
                     </button>
                 </div>
             </div>
         </div>
         
         <div class="content">
-            <div class="section-title"><i class="fas fa-list"></i> Managed Whitelist</div>
+            <div class="section-title"><svg class="icon"><use href="#i-list"/></svg> Managed Whitelist</div>
             <div class="card" style="padding: 0; overflow: hidden;">
                 <table id="whitelist-table">
                     <thead>
@@ -440,6 +830,15 @@ def get_ip_management_html(whitelist, theme=''):
                         <!-- Content loaded via JS -->
                     </tbody>
                 </table>
+                <template id="wl-row">
+                    <tr>
+                        <td><span class="cidr-badge"></span></td>
+                        <td class="ip-cell"></td>
+                        <td style="text-align: center;">
+                            <button class="action-btn" title="Remove"><svg class="icon"><use href="#i-trash"/></svg></button>
+                        </td>
+                    </tr>
+                </template>
                 <div id="empty-whitelist" class="empty-table" style="display: none;">
                     No IPs are currently whitelisted.
                 </div>
@@ -447,7 +846,7 @@ def get_ip_management_html(whitelist, theme=''):
             
             <!-- Reboot Warning -->
             <div class="card" style="background: rgba(255, 184, 108, 0.1); border: 2px solid var(--accent-orange); display: flex; align-items: center; gap: 15px; margin-bottom: 25px;">
-                <i class="fas fa-redo-alt fa-2x" style="color: var(--accent-orange);"></i>
+                <svg class="icon icon-2x" style="color: var(--accent-orange); flex-shrink: 0;"><use href="#i-redo"/></svg>
                 <div>
                     <h3 style="color: var(--accent-orange); margin-bottom: 4px; font-size: 16px;">Reboot Required</h3>
                     <p style="font-size: 13px; opacity: 0.9;">A server reboot is necessary to fully apply IP whitelist changes to all streaming services.</p>
@@ -456,7 +855,7 @@ def get_ip_management_html(whitelist, theme=''):
 
             <div class="card" style="background: rgba(139, 233, 253, 0.05); border-color: rgba(139, 233, 253, 0.2);">
                 <div style="color: var(--accent-cyan); font-size: 14px; display: flex; align-items: flex-start; gap: 12px;">
-                    <i class="fas fa-info-circle" style="margin-top: 3px;"></i>
+                    <svg class="icon" style="margin-top: 3px; flex-shrink: 0;"><use href="#i-info"/></svg>
                     <div>
                         <strong>What is Whitelisting?</strong>
                         <p style="margin-top: 5px; color: var(--text-main); font-size: 13px; opacity: 0.8;">
@@ -470,11 +869,26 @@ def get_ip_management_html(whitelist, theme=''):
 
             <!-- Active Sessions (horizontal) -->
             <div class="section-title" style="margin-top: 30px; display: flex; justify-content: space-between; align-items: center;">
-                <span><i class="fas fa-satellite-dish"></i> Active Sessions</span>
-                <i class="fas fa-sync-alt" style="cursor: pointer; font-size: 13px;" onclick="refreshSessions()" title="Refresh"></i>
+                <span><svg class="icon"><use href="#i-broadcast"/></svg> Active Sessions</span>
+                <span style="cursor: pointer; font-size: 13px; display: flex;" onclick="refreshSessions()" title="Refresh"><svg class="icon"><use href="#i-refresh"/></svg></span>
             </div>
+            <template id="session-item">
+                <div class="session-item">
+                    <div class="session-header">
+                        <span class="session-ip"></span>
+                        <span class="session-badge"><svg class="icon"><use href="#i-check"/></svg> <span class="session-status"></span></span>
+                    </div>
+                    <div class="session-info">
+                        Watching <span class="session-path"></span><br>
+                        via <span class="session-protocol"></span> • <span class="session-age"></span>
+                    </div>
+                    <button class="btn btn-success" style="padding: 4px 8px; font-size: 10px; width: auto; margin-top: 8px;">
+                        <svg class="icon"><use href="#i-plus"/></svg> Quick Whitelist
+                    </button>
+                </div>
+            </template>
             <div id="sessions-list" class="sessions-grid">
-                <div class="sessions-msg"><i class="fas fa-circle-notch fa-spin"></i> Loading...</div>
+                <div class="sessions-msg"><svg class="icon icon-spin"><use href="#i-spinner"/></svg> Loading...</div>
             </div>
         </div>
     </div>
@@ -483,161 +897,81 @@ def get_ip_management_html(whitelist, theme=''):
         <div class="spinner"></div>
     </div>
 
-    <script>
-        let currentWhitelist = {whitelist};
+    <script>window.currentWhitelist = __WHITELIST__;</script>
+    <script src="__IP_MANAGEMENT_JS_URL__"></script>
+</body>
+</html>
+'''
 
-        function renderWhitelist() {{
-            const tbody = document.getElementById('whitelist-body');
-            const empty = document.getElementById('empty-whitelist');
-            tbody.innerHTML = '';
 
-            if (currentWhitelist.length === 0) {{
-                empty.style.display = 'block';
-                return;
-            }}
-
-            empty.style.display = 'none';
-            currentWhitelist.forEach((entry, index) => {{
-                const isCidr = entry.includes('/');
-                const tr = document.createElement('tr');
-                tr.innerHTML = `
-                    <td><span class="cidr-badge">${{isCidr ? 'CIDR Block' : 'Single IP'}}</span></td>
-                    <td class="ip-cell">${{entry}}</td>
-                    <td style="text-align: center;">
-                        <button class="action-btn" onclick="removeFromWhitelist(${{index}})" title="Remove">
-                            <i class="fas fa-trash-alt"></i>
-                        </button>
-                    </td>
-                `;
-                tbody.appendChild(tr);
-            }});
-        }}
-
-        async function addToWhitelist() {{
-            const input = document.getElementById('new-ip');
-            const ip = input.value.trim();
-            if (!ip) return;
+# The literals above stay readable for editing; only the minified form is served
+_CSS_ASSET = prebuild(minify_css(_IP_MANAGEMENT_CSS.replace('__APP_THEME_CSS__', APP_THEME_CSS)))
+_JS_ASSET = prebuild(_IP_MANAGEMENT_JS)
+# Fingerprinted so both can be cached indefinitely; a release that changes
+# either one changes its URL
+IP_MANAGEMENT_CSS_URL = f"/ip-management/ip_management.css?v={_CSS_ASSET[2][:12]}"
+IP_MANAGEMENT_JS_URL = f"/ip-management/ip_management.js?v={_JS_ASSET[2][:12]}"
 
-            // Simple validation
-            if (!ip.includes('.') && !ip.includes(':')) {{
-                alert('Invalid IP address format');
-                return;
-            }}
 
-            showLoading(true);
-            try {{
-                const newWhitelist = [...currentWhitelist, ip];
-                const response = await fetch('/api/settings/whitelist', {{
-                    method: 'POST',
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: JSON.stringify({{ whitelist: newWhitelist }})
-                }});
-
-                if (response.ok) {{
-                    currentWhitelist = newWhitelist;
-                    renderWhitelist();
-                    input.value = '';
-                }} else {{
-                    const data = await response.json();
-                    alert('Error: ' + (data.error || 'Failed to save whitelist'));
-                }}
-            }} catch (err) {{
-                alert('Connection error: ' + err.message);
-            }} finally {{
-                showLoading(false);
-            }}
-        }}
+def _split_page(html):
+    """Split the page around its two per-request values: (head, body_pre, body_post).
 
-        async function removeFromWhitelist(index) {{
-            if (!confirm('Are you sure you want to remove this entry?')) return;
+    Done once at import, so a request only joins a few ready-made strings
+    instead of searching the whole page.
+    """
+    head, _, body = html.partition('<body>')
+    body_pre, _, body_post = body.partition('__WHITELIST__')
+    return head, body_pre, body_post
 
-            showLoading(true);
-            try {{
-                const newWhitelist = currentWhitelist.filter((_, i) => i !== index);
-                const response = await fetch('/api/settings/whitelist', {{
-                    method: 'POST',
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: JSON.stringify({{ whitelist: newWhitelist }})
-                }});
-
-                if (response.ok) {{
-                    currentWhitelist = newWhitelist;
-                    renderWhitelist();
-                }} else {{
-                    alert('Failed to update whitelist');
-                }}
-            }} catch (err) {{
-                alert('Connection error: ' + err.message);
-            }} finally {{
-                showLoading(false);
-            }}
-        }}
 
-        async function refreshSessions() {{
-            const list = document.getElementById('sessions-list');
-            try {{
-                const response = await fetch('/api/sessions');
-                const sessions = await response.json();
-                
-                if (sessions.length === 0) {{
-                    list.innerHTML = '<div class="sessions-msg">No active connections.</div>';
-                    return;
-                }}
-
-                list.innerHTML = '';
-                sessions.forEach(s => {{
-                    const item = document.createElement('div');
-                    item.className = 'session-item';
-                    item.innerHTML = `
-                        <div class="session-header">
-                            <span class="session-ip">${{s.cleanIp}}</span>
-                            <span class="session-badge ${{s.whitelisted ? 'whitelisted' : ''}}">
-                                ${{s.whitelisted ? '<i class="fas fa-check"></i> Whitelisted' : 'Authenticated'}}
-                            </span>
-                        </div>
-                        <div class="session-info">
-                            Watching <span class="session-path">/${{s.path}}</span><br>
-                            via ${{s.protocol}} • ${{getRelativeTime(s.created)}}
-                        </div>
-                        ${{!s.whitelisted ? `
-                            <button class="btn btn-success" style="padding: 4px 8px; font-size: 10px; width: auto; margin-top: 8px;" onclick="quickWhitelist('${{s.cleanIp}}')">
-                                <i class="fas fa-plus"></i> Quick Whitelist
-                            </button>
-                        ` : ''}}
-                    `;
-                    list.appendChild(item);
-                }});
-            }} catch (err) {{
-                list.innerHTML = '<div class="sessions-msg" style="color: var(--accent-red);">Failed to load sessions.</div>';
-            }}
-        }}
+_PAGE_HEAD, _BODY_PRE, _BODY_POST = _split_page(
+    minify_html(_IP_MANAGEMENT_HTML)
+    .replace('__IP_MANAGEMENT_CSS_URL__', IP_MANAGEMENT_CSS_URL)
+    .replace('__IP_MANAGEMENT_JS_URL__', IP_MANAGEMENT_JS_URL))
 
-        async function quickWhitelist(ip) {{
-            const input = document.getElementById('new-ip');
-            input.value = ip;
-            addToWhitelist();
-        }}
 
-        function getRelativeTime(timestamp) {{
-            const date = new Date(timestamp);
-            const now = new Date();
-            const elapsed = Math.floor((now - date) / 1000);
-            
-            if (elapsed < 60) return 'Just now';
-            if (elapsed < 3600) return Math.floor(elapsed / 60) + 'm ago';
-            return Math.floor(elapsed / 3600) + 'h ago';
-        }}
+@functools.lru_cache(maxsize=32)
+def _get_page_head(theme):
+    return f'{_PAGE_HEAD}<body class="{body_theme_class(theme)}">'
 
-        function showLoading(show) {{
-            document.getElementById('loading').style.display = show ? 'flex' : 'none';
-        }}
 
-        // Initial load
-        renderWhitelist();
-        refreshSessions();
-        // Auto-refresh sessions every 10 seconds
-        setInterval(refreshSessions, 10000);
-    </script>
-</body>
-</html>
-'''
+def describe_whitelist(whitelist):
+    """Return whitelist entries as the page expects them: [{'ip', 'cidr'}, ...]"""
+    return [{'ip': entry, 'cidr': '/' in entry} for entry in whitelist]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_whitelist_json(whitelist):
+    """Serialize a whitelist tuple for the page; only redone after it changes"""
+    # JSON is a valid JS literal; '</' is escaped so an entry can't close the <script>
+    return json.dumps(describe_whitelist(whitelist), separators=(',', ':')).replace('</', '<\\/')
+
+
+def get_ip_management_html(whitelist, theme=''):
+    """Return the IP management page for the given whitelist and theme"""
+    return ''.join((_get_page_head(theme), _BODY_PRE, _get_whitelist_json(tuple(whitelist)),
+                    _BODY_POST))
+
+
+@functools.lru_cache(maxsize=8)
+def _get_prebuilt_page(whitelist, theme):
+    return prebuild(get_ip_management_html(whitelist, theme))
+
+
+def get_ip_management_page(whitelist, theme=''):
+    """Return (body, gzip_body, etag) for the IP management page.
+
+    Encoded and compressed once per whitelist and theme, so requests in
+    between just write out bytes.
+    """
+    return _get_prebuilt_page(tuple(whitelist), theme)
+
+
+def get_ip_management_css():
+    """Return (body, gzip_body, etag) for the IP management stylesheet"""
+    return _CSS_ASSET
+
+
+def get_ip_management_js():
+    """Return (body, gzip_body, etag) for the IP management script"""
+    return _JS_ASSET
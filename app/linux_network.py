@@ -1,36 +1,171 @@
 import subprocess
-import platform
 import os
+import sys
 import re
+import select
+import shutil
+import socket
+import threading
 import time
+from functools import lru_cache
+
+# The platform cannot change at runtime, so decide once at import
+_IS_LINUX = sys.platform.startswith('linux')
+
+# Seconds the isolated dhclient waits for a lease before giving up
+DHCP_LEASE_TIMEOUT = 5
+# Overall budget shared by all DHCP attempts in setup_ip()
+DHCP_TOTAL_TIMEOUT = 15
+
+_RTMGRP_IPV4_IFADDR = 0x10
+_RE_INET = re.compile(rb'inet (\d+\.\d+\.\d+\.\d+)')
+_RE_VNIC = re.compile(rb'vnic_[^:@\s]+')
+
+# Physical NICs rarely change at runtime; rescanning /sys on every lookup is wasted work
+PHYSICAL_IFACE_TTL = 10
+_iface_cache = {"ts": 0.0, "data": None}
+_iface_cache_lock = threading.Lock()
+
+# Cameras may start concurrently; link changes made through 'ip' are
+# serialized behind this lock. DHCP runs in parallel, since every dhclient
+# gets its own pid and lease files (see _dhclient_files).
+_link_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _which(cmd):
+    return shutil.which(cmd) or cmd
+
+def _run(args, **kwargs):
+    """subprocess.run() arranged to take CPython's posix_spawn fast path.
+
+    subprocess only uses posix_spawn (no fork of this large process) when the
+    executable is an absolute path and close_fds is off. Python's own file
+    descriptors are non-inheritable by default, so nothing leaks to the child.
+    """
+    kwargs.setdefault('close_fds', False)
+    return subprocess.run([_which(args[0]), *args[1:]], **kwargs)
+
+def _get_ipv4(name):
+    """Return the first IPv4 address of an interface, or None if it has none"""
+    # Bytes output and a precompiled pattern: no decode or regex lookup per poll
+    result = _run(['ip', '-4', 'addr', 'show', name], capture_output=True)
+    match = _RE_INET.search(result.stdout)
+    return match.group(1).decode() if match else None
+
+def _open_addr_monitor():
+    """Subscribe to kernel IPv4 address change notifications.
+
+    Returns a netlink socket, or None where netlink is unavailable (non-Linux,
+    restricted containers) so callers fall back to sleep-polling.
+    """
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    except (AttributeError, OSError):
+        return None
+    try:
+        sock.bind((0, _RTMGRP_IPV4_IFADDR))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def _wait_for_ipv4(name, timeout, monitor=None):
+    """Wait up to timeout seconds for name to get an IPv4 address.
+
+    With a monitor from _open_addr_monitor() the address is re-checked as soon
+    as the kernel announces a change; without one it is polled once a second.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        assigned_ip = _get_ipv4(name)
+        if assigned_ip:
+            return assigned_ip
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if monitor is None:
+            time.sleep(min(1, remaining))
+            continue
+        ready, _, _ = select.select([monitor], [], [], remaining)
+        if ready:
+            # Any RTM_NEWADDR/RTM_DELADDR wakes us; the address check above decides
+            monitor.recv(65536)
+
+def _dhclient_files(name):
+    """dhclient arguments giving name its own pid and lease files.
+
+    With the shared defaults a second dhclient kills the first one through the
+    pid file, so interfaces could only get their leases one at a time.
+    """
+    return ['-pf', f'/run/dhclient-{name}.pid', '-lf', f'/var/lib/dhcp/dhclient-{name}.leases']
+
+def _write_dhclient_conf(name):
+    """Write the isolated dhclient.conf for name and return its path.
+
+    A real file is used on purpose: dhclient runs under sudo and is often
+    confined (e.g. Ubuntu's AppArmor profile), so it can't be relied on to
+    read descriptors of ours through /proc.
+    """
+    conf_path = f"/tmp/dhclient_{name}.conf"
+    with open(conf_path, 'w') as f:
+        f.write(f'interface "{name}" {{\n')
+        f.write('    # Request only IP and subnet, skip DNS and Routers to avoid breaking host connection\n')
+        f.write('    request subnet-mask, broadcast-address, time-offset, host-name, interface-mtu;\n')
+        f.write('}\n')
+        f.write(f'timeout {DHCP_LEASE_TIMEOUT};\n')
+    return conf_path
+
+def _stop_isolated_dhclient(name, conf_path):
+    """Kill the isolated dhclient started for name and release its interface"""
+    # Match on the unique -cf argument; the brackets keep the pattern from
+    # matching the sudo/pkill command line that carries it
+    pattern = f"[-]cf {re.escape(conf_path)}"
+    try:
+        _run(['sudo', 'pkill', '-f', pattern], check=False, timeout=5)
+        _run(['sudo', 'dhclient', '-r', *_dhclient_files(name), name], check=False, timeout=5)
+    except Exception as e:
+        print(f"  Failed to stop 'dhclient' for {name}: {e}")
 
 class LinuxNetworkManager:
     """Manages Linux network interfaces for virtual cameras"""
     
     @staticmethod
     def is_linux():
-        return platform.system().lower() == "linux"
+        return _IS_LINUX
         
     @staticmethod
     def get_physical_interfaces():
         """Get a list of physical network interfaces"""
         if not LinuxNetworkManager.is_linux():
             return []
-            
-        try:
-            # Look in /sys/class/net
-            interfaces = os.listdir('/sys/class/net')
-            # Filter out loopback and virtual ones (usually)
-            physical = []
-            for iface in interfaces:
-                if iface == 'lo':
-                    continue
-                # Check if it's a physical device (has a 'device' link)
-                if os.path.exists(f'/sys/class/net/{iface}/device'):
-                    physical.append(iface)
-            return physical
-        except:
-            return []
+
+        with _iface_cache_lock:
+            now = time.monotonic()
+            if _iface_cache["data"] is not None and now - _iface_cache["ts"] < PHYSICAL_IFACE_TTL:
+                return list(_iface_cache["data"])
+
+            try:
+                # Look in /sys/class/net, filtering out loopback and virtual ones (usually)
+                physical = []
+                with os.scandir('/sys/class/net') as entries:
+                    for entry in entries:
+                        if entry.name == 'lo':
+                            continue
+                        # Check if it's a physical device (has a 'device' link); lexists
+                        # lstats the link itself rather than resolving it into /sys/devices
+                        if os.path.lexists(entry.path + '/device'):
+                            physical.append(entry.name)
+            except:
+                return []
+            _iface_cache["ts"] = now
+            _iface_cache["data"] = physical
+            return list(physical)
+
+    @staticmethod
+    def invalidate_interface_cache():
+        """Force the next get_physical_interfaces() call to rescan /sys/class/net"""
+        with _iface_cache_lock:
+            _iface_cache["data"] = None
 
     def create_macvlan(self, parent_if, name, mac):
         """Create a MACVLAN interface"""
@@ -49,21 +184,26 @@ class LinuxNetworkManager:
             return False
 
         try:
-            # 1. Enable promiscuous mode on parent (often required for MACVLAN to work)
+            # Best-effort steps first, in one 'ip -force -batch' run whose failures are
+            # ignored (as they always were); then the steps that must all succeed.
             print(f"  Enabling promiscuous mode on {parent_if}...")
-            subprocess.run(['sudo', 'ip', 'link', 'set', parent_if, 'promisc', 'on'], check=False)
-
+            # 1. Enable promiscuous mode on parent (often required for MACVLAN to work)
+            prep = [f'link set {parent_if} promisc on']
             # 2. Check if interface already exists and remove it
             if os.path.exists(f'/sys/class/net/{name}'):
-                subprocess.run(['sudo', 'ip', 'link', 'delete', name], check=False)
-            
+                prep.append(f'link delete {name}')
+            # Without -force, ip stops at the first failing line and exits non-zero
+            batch = []
             # 3. Create the link
-            subprocess.run(['sudo', 'ip', 'link', 'add', name, 'link', parent_if, 'type', 'macvlan', 'mode', 'bridge'], check=True)
+            batch.append(f'link add {name} link {parent_if} type macvlan mode bridge')
             # 4. Set MAC address
-            subprocess.run(['sudo', 'ip', 'link', 'set', name, 'address', mac], check=True)
-            
+            batch.append(f'link set {name} address {mac}')
             # 5. Bring it up
-            subprocess.run(['sudo', 'ip', 'link', 'set', name, 'up'], check=True)
+            batch.append(f'link set {name} up')
+            with _link_lock:
+                _run(['sudo', 'ip', '-force', '-batch', '-'], input='\n'.join(prep) + '\n', text=True, check=False)
+                _run(['sudo', 'ip', '-batch', '-'], input='\n'.join(batch) + '\n', text=True, check=True)
+                self.invalidate_interface_cache()
 
             # 6. Apply ARP isolation to prevent host from "hijacking" the virtual IP (ARP Flux)
             # This is crucial for stability when multiple IPs are on one physical interface
@@ -81,12 +221,15 @@ class LinuxNetworkManager:
             _stdout = None if debug_mode else subprocess.DEVNULL
             _stderr = None if debug_mode else subprocess.DEVNULL
 
-            subprocess.run(['sudo', 'sysctl', '-w', f'net.ipv4.conf.{name}.arp_ignore=1'], stdout=_stdout, stderr=_stderr, check=False)
-            subprocess.run(['sudo', 'sysctl', '-w', f'net.ipv4.conf.{name}.arp_announce=2'], stdout=_stdout, stderr=_stderr, check=False)
-            subprocess.run(['sudo', 'sysctl', '-w', f'net.ipv4.conf.{parent_if}.arp_ignore=1'], stdout=_stdout, stderr=_stderr, check=False)
-            subprocess.run(['sudo', 'sysctl', '-w', f'net.ipv4.conf.{parent_if}.arp_announce=2'], stdout=_stdout, stderr=_stderr, check=False)
-            subprocess.run(['sudo', 'sysctl', '-w', 'net.ipv4.conf.all.arp_ignore=1'], stdout=_stdout, stderr=_stderr, check=False)
-            subprocess.run(['sudo', 'sysctl', '-w', 'net.ipv4.conf.all.arp_announce=2'], stdout=_stdout, stderr=_stderr, check=False)
+            _run([
+                'sudo', 'sysctl', '-w',
+                f'net.ipv4.conf.{name}.arp_ignore=1',
+                f'net.ipv4.conf.{name}.arp_announce=2',
+                f'net.ipv4.conf.{parent_if}.arp_ignore=1',
+                f'net.ipv4.conf.{parent_if}.arp_announce=2',
+                'net.ipv4.conf.all.arp_ignore=1',
+                'net.ipv4.conf.all.arp_announce=2',
+            ], stdout=_stdout, stderr=_stderr, check=False)
             
             return True
         except subprocess.CalledProcessError as e:
@@ -100,69 +243,71 @@ class LinuxNetworkManager:
             
         try:
             if mode == 'dhcp':
-                print(f"  Requesting DHCP for {name} (timeout 15s)...")
+                print(f"  Requesting DHCP for {name} (timeout {DHCP_TOTAL_TIMEOUT}s)...")
+                # Every attempt below draws from one deadline, and each stops at the first
+                # address, so a dead network costs DHCP_TOTAL_TIMEOUT rather than the sum
+                deadline = time.monotonic() + DHCP_TOTAL_TIMEOUT
                 
                 # Try dhclient with a custom config to prevent it from touching host DNS/Routes
                 try:
+                    # Clean up any stale PIDs or leases
+                    _run(['sudo', 'dhclient', '-r', *_dhclient_files(name), name], check=False, timeout=5)
+
                     # Create a minimal dhclient.conf that doesn't request DNS or Routers
-                    conf_path = f"/tmp/dhclient_{name}.conf"
-                    with open(conf_path, 'w') as f:
-                        f.write(f'interface "{name}" {{\n')
-                        f.write('    # Request only IP and subnet, skip DNS and Routers to avoid breaking host connection\n')
-                        f.write('    request subnet-mask, broadcast-address, time-offset, host-name, interface-mtu;\n')
-                        f.write('}\n')
+                    conf_path = _write_dhclient_conf(name)
+                    # Run with custom config in the foreground: dhclient returns as soon as
+                    # the lease is bound (then daemonizes to renew it), or exits after
+                    # DHCP_LEASE_TIMEOUT, so there is no need to poll for the address.
+                    try:
+                        _run(['sudo', 'dhclient', '-1', '-cf', conf_path, *_dhclient_files(name), name], check=False,
+                             timeout=max(1, min(DHCP_LEASE_TIMEOUT + 3, deadline - time.monotonic())))
+                    except subprocess.TimeoutExpired:
+                        # The timeout only kills the sudo wrapper; stop the dhclient it
+                        # started as well so it can't race the fallbacks below
+                        print(f"  'dhclient' did not finish in time, stopping it...")
+                        _stop_isolated_dhclient(name, conf_path)
+                    finally:
+                        # Clean up temp conf (dhclient only reads it at startup)
+                        try: os.remove(conf_path)
+                        except: pass
 
-                    # Clean up any stale PIDs or leases
-                    subprocess.run(['sudo', 'dhclient', '-r', name], check=False, timeout=5)
-                    # Run with custom config
-                    subprocess.run(['sudo', 'dhclient', '-1', '-nw', '-cf', conf_path, name], check=False)
-                    
-                    # Wait up to 5 seconds for IP (most fast networks respond in 1-2s)
-                    for _ in range(5):
-                        result = subprocess.run(['ip', '-4', 'addr', 'show', name], capture_output=True, text=True)
-                        match = re.search(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                        if match:
-                            assigned_ip = match.group(1)
-                            print(f"  IP assigned: {assigned_ip}")
-                            # Clean up temp conf
-                            try: os.remove(conf_path)
-                            except: pass
-                            return assigned_ip
-                        time.sleep(1)
-                        
-                    # Clean up temp conf if failed
-                    try: os.remove(conf_path)
-                    except: pass
+                    assigned_ip = _get_ipv4(name)
+                    if assigned_ip:
+                        print(f"  IP assigned: {assigned_ip}")
+                        return assigned_ip
                 except Exception as e:
                     print(f"  'dhclient' attempt failed: {e}")
 
                 # Try udhcpc if dhclient isolated attempt fails
-                try:
-                    print(f"  Isolated DHCP failed, trying 'udhcpc' fallback...")
-                    subprocess.run(['sudo', 'udhcpc', '-i', name, '-n', '-q', '-T', '1', '-t', '5', '-s', '/bin/true'], check=True, timeout=7)
-                except:
-                    pass
+                remaining = deadline - time.monotonic()
+                if remaining > 1:
+                    try:
+                        print(f"  Isolated DHCP failed, trying 'udhcpc' fallback...")
+                        _run(['sudo', 'udhcpc', '-i', name, '-n', '-q', '-T', '1', '-t', '5', '-s', '/bin/true'],
+                             check=True, timeout=min(7, remaining))
+                    except:
+                        pass
 
                 # Ultimate Fallback: Try plain dhclient (exactly like user's manual command)
                 # Keep this as a last resort as it might touch host routes
-                result = subprocess.run(['ip', '-4', 'addr', 'show', name], capture_output=True, text=True)
-                if not re.search(r'inet \d+', result.stdout):
+                remaining = deadline - time.monotonic()
+                if remaining > 1 and not _get_ipv4(name):
+                    # Subscribe before starting dhclient so the address event can't be missed
+                    monitor = _open_addr_monitor()
                     try:
                         print(f"  Standard DHCP attempts failed. Trying plain 'dhclient' (User Success Mode)...")
-                        subprocess.run(['sudo', 'dhclient', '-nw', name], check=False)
+                        _run(['sudo', 'dhclient', '-nw', *_dhclient_files(name), name], check=False)
                         # Wait a bit
-                        for _ in range(3):
-                            result = subprocess.run(['ip', '-4', 'addr', 'show', name], capture_output=True, text=True)
-                            if re.search(r'inet \d+', result.stdout): break
-                            time.sleep(1)
+                        _wait_for_ipv4(name, min(3, remaining), monitor)
                     except:
                         pass
+                    finally:
+                        if monitor is not None:
+                            monitor.close()
                 
                 # Check final result
-                result = subprocess.run(['ip', '-4', 'addr', 'show', name], capture_output=True, text=True)
-                match = re.search(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                if match:
-                    assigned_ip = match.group(1)
+                assigned_ip = _get_ipv4(name)
+                if assigned_ip:
                     print(f"  ✓ IP assigned: {assigned_ip}")
                     return assigned_ip
                 
@@ -174,7 +319,7 @@ class LinuxNetworkManager:
                 print(f"  Setting static IP {ip} for {name}...")
                 full_ip = f"{ip}/{mask}" if mask else ip
                 # Add the IP address
-                subprocess.run(['sudo', 'ip', 'addr', 'add', full_ip, 'dev', name], check=True)
+                _run(['sudo', 'ip', 'addr', 'add', full_ip, 'dev', name], check=True)
                 
                 # IMPORTANT: We do NOT add a 'default gateway' here.
                 # Adding a default route to a virtual interface will override the host's 
@@ -189,21 +334,25 @@ class LinuxNetworkManager:
         return None
 
     def remove_interface(self, name):
-        """Clean up virtual interface"""
+        """Clean up virtual interface; returns True once the link is gone"""
         if not self.is_linux():
-            return
+            return True
             
         print(f"Removing Virtual NIC {name}...")
         try:
             # Release DHCP
             try:
-                subprocess.run(['sudo', 'dhclient', '-r', name], check=False)
+                _run(['sudo', 'dhclient', '-r', *_dhclient_files(name), name], check=False)
             except:
                 pass
             # Delete link
-            subprocess.run(['sudo', 'ip', 'link', 'delete', name], check=False)
+            with _link_lock:
+                _run(['sudo', 'ip', 'link', 'delete', name], check=False)
+                self.invalidate_interface_cache()
+            return not os.path.exists(f'/sys/class/net/{name}')
         except Exception as e:
             print(f"Error cleaning up NIC {name}: {e}")
+            return False
 
     def cleanup_all_vnics(self):
         """Global cleanup of all vnic_ interfaces at startup"""
@@ -213,16 +362,24 @@ class LinuxNetworkManager:
         print("Cleaning up old virtual network interfaces...")
         try:
             # Get list of all interfaces
-            result = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True)
+            result = _run(['ip', 'link', 'show'], capture_output=True)
             # Find all interfaces starting with vnic_
-            vnics = re.findall(r'vnic_[^:@\s]+', result.stdout)
+            vnics = _RE_VNIC.findall(result.stdout)
             
-            # Remove duplicates and clean up
-            cleaned = []
-            for vnic in set(vnics):
-                if vnic not in cleaned:
-                    self.remove_interface(vnic)
-                    cleaned.append(vnic)
+            # Remove duplicates, then release and delete them all in two commands
+            # instead of two per interface
+            cleaned = sorted(vnic.decode() for vnic in set(vnics))
+            if cleaned:
+                # Each leftover client has its own pid file, so release them one by one
+                for vnic in cleaned:
+                    try:
+                        _run(['sudo', 'dhclient', '-r', *_dhclient_files(vnic), vnic], check=False, timeout=5)
+                    except Exception:
+                        pass
+                batch = ''.join(f'link delete {vnic}\n' for vnic in cleaned)
+                with _link_lock:
+                    _run(['sudo', 'ip', '-force', '-batch', '-'], input=batch, text=True, check=False)
+                    self.invalidate_interface_cache()
             
             if cleaned:
                 print(f"  Cleaned up {len(cleaned)} stale virtual interfaces.")
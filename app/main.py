@@ -1,8 +1,8 @@
 import sys
 import time
 import threading
-import webbrowser
-from .utils import cleanup_stale_processes, get_local_ip
+from concurrent.futures import ThreadPoolExecutor
+from .utils import cleanup_stale_processes, get_local_ip, mark_clean_shutdown, consume_clean_shutdown_marker
 from .manager import CameraManager
 from .linux_network import LinuxNetworkManager
 from .config import WEB_UI_PORT, MEDIAMTX_PORT
@@ -10,19 +10,25 @@ from .web import create_web_app
 from .version import CURRENT_VERSION
 from .updater import check_for_updates
 
+# Upper bound on cameras brought up at once during auto-start
+AUTO_START_WORKERS = 8
+
 # Global events for signaling
 shutdown_event = threading.Event()
 restart_requested = False
 
 def main():
     """Main application entry point"""
-    # Clean up before starting
-    cleanup_stale_processes()
-    
-    # Clean up virtual network interfaces (Linux)
-    if LinuxNetworkManager.is_linux():
-        net_mgr = LinuxNetworkManager()
-        net_mgr.cleanup_all_vnics()
+    # Clean up before starting, unless the last run already tore everything down
+    if consume_clean_shutdown_marker():
+        print("Clean prior shutdown detected, skipping stale process and interface cleanup")
+    else:
+        cleanup_stale_processes()
+
+        # Clean up virtual network interfaces (Linux)
+        if LinuxNetworkManager.is_linux():
+            net_mgr = LinuxNetworkManager()
+            net_mgr.cleanup_all_vnics()
 
     print(f"\nTonys Onvif-RTSP-AI Server\n")
     
@@ -85,8 +91,17 @@ def main():
     auto_start_cameras = [cam for cam in manager.cameras if cam.auto_start]
     if auto_start_cameras:
         print(f"\nAuto-starting {len(auto_start_cameras)} camera(s)...")
-        for camera in auto_start_cameras:
+        # Bring cameras up concurrently so their DHCP waits overlap. Each vnic's
+        # dhclient has its own pid/lease files and linux_network serializes the
+        # 'ip' link changes, so the starts don't interfere.
+        # map() yields in input order, keeping the summary below readable.
+        def start_camera(camera):
             camera.start()
+            return camera
+        workers = min(AUTO_START_WORKERS, len(auto_start_cameras))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='CameraStart') as executor:
+            started = list(executor.map(start_camera, auto_start_cameras))
+        for camera in started:
             print(f"  Started: {camera.name}")
             print("-" * 40)
         print("\n" + "=" * 60)
@@ -126,6 +141,7 @@ def main():
     if settings.get('openBrowser', False) is True:
         print(f"Opening browser...\n")
         try:
+            import webbrowser
             webbrowser.open(f'http://localhost:{web_ui_port}')
         except:
             pass
@@ -160,19 +176,26 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     try:
-        # Wait until shutdown is triggered
-        while not shutdown_event.is_set():
-            time.sleep(1)
+        # Wait until shutdown is triggered. The signal handlers set the event, so
+        # block on it instead of waking every second. On Windows a wait without a
+        # timeout can't be interrupted by Ctrl+C, so keep a 1s timeout there.
+        wait_timeout = 1 if sys.platform == 'win32' else None
+        while not shutdown_event.wait(wait_timeout):
+            pass
             
     except KeyboardInterrupt:
         print("\n\nShutdown requested (KeyboardInterrupt)...")
         
     # Perform clean shutdown
     print("Stopping MediaMTX...")
-    manager.mediamtx.stop()
+    clean = manager.mediamtx.stop()
     print("Stopping all cameras...")
     for camera in manager.cameras:
-        camera.stop()
+        if not camera.stop():
+            clean = False
+    # Only vouch for a clean slate if every teardown step succeeded
+    if clean:
+        mark_clean_shutdown()
         
     print("Server stopped successfully.")
     return 5 if restart_requested else 0
@@ -924,15 +924,21 @@ class MediaMTXManager:
             return False
 
     def stop(self):
-        """Stop MediaMTX server"""
+        """Stop MediaMTX server; returns False if the process could not be reaped"""
+        stopped = True
         if self.process:
             self.process.terminate()
             try:
                 self.process.wait(timeout=5)
             except:
                 self.process.kill()
+                try:
+                    self.process.wait(timeout=5)
+                except Exception:
+                    stopped = False
             self.process = None
             print("MediaMTX stopped")
+        return stopped
     
     def restart(self, cameras, rtsp_port=None, rtsp_username=None, rtsp_password=None, grid_fusion=None, debug_mode=False, advanced_settings=None, web_port=None):
         """Restart MediaMTX with new configuration"""
@@ -0,0 +1,37 @@
+"""
+Build-time helpers for the standalone pages (Diagnostics, IP Management)
+
+Each page keeps its CSS, JS and HTML as readable literals and prebuilds the
+served form once at import. Only CSS and HTML are minified: line-based
+stripping would corrupt multi-line JavaScript template literals, so scripts
+are served as written.
+"""
+import gzip
+import hashlib
+import re
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+
+
+def strip_indentation(text):
+    """Drop indentation and blank lines, keeping one newline between lines.
+
+    Newlines are kept so whitespace between tokens is never removed, which
+    makes this safe for CSS and HTML without a real minifier.
+    """
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def minify_css(css):
+    return strip_indentation(_CSS_COMMENT_RE.sub('', css))
+
+
+def minify_html(html):
+    return strip_indentation(_HTML_COMMENT_RE.sub('', html))
+
+
+def prebuild(text):
+    """Encode text once and return (body, gzip_body, etag) for serving"""
+    body = text.encode('utf-8')
+    return body, gzip.compress(body, compresslevel=9, mtime=0), hashlib.sha1(body).hexdigest()
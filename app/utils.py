@@ -1,3 +1,4 @@
+import os
 import sys
 import subprocess
 import importlib.util
@@ -5,9 +6,27 @@ import platform
 import collections
 import threading
 import socket
+import time
+
+# get_local_ip() is called on every camera start and every camera to_dict();
+# remember the answer briefly so bulk operations don't repeat the lookup (and
+# its blocking gethostbyname fallback) for each camera.
+LOCAL_IP_CACHE_TTL = 30.0
+_local_ip_cache = (0.0, None)
 
 def get_local_ip():
-    """Get the primary local IP address of this machine"""
+    """Get the primary local IP address of this machine (cached briefly)"""
+    global _local_ip_cache
+    checked_at, ip = _local_ip_cache
+    now = time.monotonic()
+    if ip and now - checked_at < LOCAL_IP_CACHE_TTL:
+        return ip
+    ip = _detect_local_ip()
+    _local_ip_cache = (now, ip)
+    return ip
+
+def _detect_local_ip():
+    """Find the egress IP via a connected UDP socket (no packet is sent)"""
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
         # doesn't even have to be reachable
@@ -164,7 +183,6 @@ def check_and_install_requirements():
         # SPECIAL CASE: Check for missing ONVIF WSDLs (common issue in some pip installs)
         try:
             import onvif
-            import os
             
             # Check for the primary WSDL file
             wsdl_dir = os.path.join(os.path.dirname(onvif.__file__), 'wsdl')
@@ -223,7 +241,6 @@ def check_and_install_system_dependencies():
 
 def cleanup_stale_processes():
     """Kill any existing MediaMTX instances and old server instances to prevent port conflicts"""
-    import os
     from .config import WEB_UI_PORT, CONFIG_FILE
     try:
         import psutil
@@ -285,3 +302,27 @@ def cleanup_stale_processes():
             
     except Exception as e:
         print(f"  Warning: Could not check/clean stale processes: {e}")
+
+def _clean_shutdown_marker():
+    from .config import DATA_DIR
+    return os.path.join(DATA_DIR, ".clean_shutdown")
+
+def mark_clean_shutdown():
+    """Record that MediaMTX and all virtual NICs were torn down on the way out"""
+    try:
+        with open(_clean_shutdown_marker(), 'w') as f:
+            f.write(f"{time.time()}\n")
+    except OSError:
+        pass
+
+def consume_clean_shutdown_marker():
+    """Return True if the previous run shut down cleanly, removing the marker.
+
+    The marker is deleted on every startup, so a crash (or a second instance
+    still running) always leaves it absent and the next start cleans up.
+    """
+    try:
+        os.remove(_clean_shutdown_marker())
+        return True
+    except OSError:
+        return False
@@ -1,3 +1,4 @@
+import ipaddress
 import json
 import os
 import sys
@@ -9,12 +10,14 @@ except ImportError:
 import time
 import functools
 from datetime import timedelta
-from flask import Flask, jsonify, request, session, redirect, url_for, make_response, send_file
+from flask import Flask, Response, jsonify, request, session, redirect, url_for, make_response, send_file
 from flask_cors import CORS
 
 from .web_template import get_web_ui_html
-from .diagnostics_template import get_diagnostics_html
-from .ip_management_template import get_ip_management_html
+from .diagnostics_template import (get_diagnostics_page, get_diagnostics_css, get_diagnostics_js,
+                                   get_diagnostics_sw)
+from .ip_management_template import (get_ip_management_page, get_ip_management_css, get_ip_management_js,
+                                    describe_whitelist)
 from .config import AI_DEFAULT_MODEL, AI_CONFIDENCE_THRESHOLD, AI_MOTION_SENSITIVITY
 
 from .ffmpeg_manager import FFmpegManager
@@ -24,6 +27,7 @@ from .utils import get_captured_logs
 from .updater import UpdateChecker, check_for_updates, download_and_apply_update, is_trusted_update_url
 import subprocess
 import threading
+import queue
 import tempfile
 import shutil
 import uuid
@@ -33,6 +37,11 @@ import uuid
 # tell a freshly-started server apart from the old, still-shutting-down one.
 SERVER_BOOT_ID = uuid.uuid4().hex
 
+# How often MediaMTX is asked for sessions while a page is subscribed to the
+# session stream, and how long a quiet stream waits before a keep-alive
+SESSION_PUSH_INTERVAL = 3
+SESSION_STREAM_PING_INTERVAL = 20
+
 
 _cached_sys_info = None
 
@@ -97,6 +106,43 @@ def get_static_sys_info():
     }
     return _cached_sys_info
 
+def _cacheable_json(payload, max_age=30):
+    """jsonify() a slow-to-build but rarely-changing payload with caching headers.
+
+    The browser may reuse it for max_age seconds; after that the ETag lets an
+    unchanged answer go back as an empty 304.
+    """
+    response = jsonify(payload)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    response.add_etag()
+    return response.make_conditional(request)
+
+def _prebuilt_response(body, gzip_body, etag, mimetype='text/html',
+                       cache_control='private, no-cache'):
+    """Serve precomputed bytes, gzip-encoded when the client accepts it.
+
+    Each encoding gets its own ETag. A matching If-None-Match is answered
+    with an empty 304 before any body is attached, and the full response is
+    built in one go from the precomputed bytes and headers.
+    """
+    use_gzip = 'gzip' in request.accept_encodings
+    if use_gzip:
+        etag = f"{etag}-gz"
+    # No Last-Modified: the same URL changes content when the theme changes,
+    # so only the content hash is a safe validator.
+    # Default Cache-Control for login-protected pages: the browser may keep a
+    # copy but has to revalidate it every time
+    headers = {
+        'ETag': f'"{etag}"',
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': cache_control,
+    }
+    if etag in request.if_none_match:
+        return Response(status=304, headers=headers)
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    return Response(gzip_body if use_gzip else body, mimetype=mimetype, headers=headers)
+
 def create_web_app(manager):
     """Create Flask web application"""
     app = Flask(__name__)
@@ -420,7 +466,8 @@ def create_web_app(manager):
     def get_analytics():
         """Get per-stream analytics from MediaMTX"""
         try:
-            return jsonify(manager.analytics.get_analytics())
+            # jsonify can't serialise the read-only mappingproxy view
+            return jsonify(dict(manager.analytics.get_analytics()))
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     @app.route('/')
@@ -1605,15 +1652,42 @@ def create_web_app(manager):
     def diagnostics():
         """Serve the diagnostic tools page"""
         theme = (manager.load_settings() or {}).get('theme', '')
-        return get_diagnostics_html(theme)
+        return _prebuilt_response(*get_diagnostics_page(theme))
+
+    @app.route('/diagnostics/diagnostics.css')
+    @login_required
+    def diagnostics_css():
+        """Serve the diagnostics stylesheet (URL is content-fingerprinted)"""
+        return _prebuilt_response(*get_diagnostics_css(), mimetype='text/css',
+                                  cache_control='private, max-age=31536000, immutable')
+
+    @app.route('/diagnostics/diagnostics.js')
+    @login_required
+    def diagnostics_js():
+        """Serve the diagnostics script (URL is content-fingerprinted)"""
+        return _prebuilt_response(*get_diagnostics_js(), mimetype='text/javascript',
+                                  cache_control='private, max-age=31536000, immutable')
+
+    @app.route('/diagnostics/sw.js')
+    @login_required
+    def diagnostics_sw():
+        """Serve the diagnostics service worker.
+
+        Its URL is fixed, so it is always revalidated; the header lets it
+        control /diagnostics itself, which is outside its default scope.
+        """
+        response = _prebuilt_response(*get_diagnostics_sw(), mimetype='text/javascript')
+        response.headers['Service-Worker-Allowed'] = '/diagnostics'
+        return response
         
     @app.route('/api/diagnostics/ping', methods=['POST'])
     @login_required
     def diag_ping():
         """Run ping test"""
-        data = request.json
+        # The diagnostics page posts a plain form; JSON is still accepted
+        data = request.get_json(silent=True) or request.form
         host = data.get('host')
-        count = min(10, data.get('count', 4))
+        count = min(10, int(data.get('count', 4)))
         
         if not host:
             return jsonify({'success': False, 'error': 'Host required'}), 400
@@ -1634,7 +1708,7 @@ def create_web_app(manager):
     @login_required
     def diag_traceroute():
         """Run traceroute test"""
-        data = request.json
+        data = request.get_json(silent=True) or request.form
         host = data.get('host')
         
         if not host:
@@ -1657,7 +1731,7 @@ def create_web_app(manager):
     def diag_port_check():
         """Check if a specific port is open"""
         import socket
-        data = request.json
+        data = request.get_json(silent=True) or request.form
         host = data.get('host')
         port = int(data.get('port', 554))
         
@@ -1980,7 +2054,7 @@ def create_web_app(manager):
                 return jsonify({'success': False, 'error': 'FFmpeg not found'}), 404
             
             result = subprocess.run([ffmpeg_exe, '-version'], capture_output=True, text=True)
-            return jsonify({
+            return _cacheable_json({
                 'success': True,
                 'version': result.stdout.split('\n')[0],
                 'full_output': result.stdout
@@ -2027,7 +2101,7 @@ def create_web_app(manager):
                     'disk_usage': 0
                 })
                 
-            return jsonify(system_info)
+            return _cacheable_json(system_info)
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -2466,24 +2540,154 @@ def create_web_app(manager):
     def ip_management():
         whitelist = manager.get_ip_whitelist()
         theme = (manager.load_settings() or {}).get('theme', '')
-        return get_ip_management_html(whitelist, theme)
+        return _prebuilt_response(*get_ip_management_page(whitelist, theme))
+
+    @app.route('/ip-management/ip_management.css')
+    @login_required
+    def ip_management_css():
+        """Serve the IP management stylesheet (URL is content-fingerprinted)"""
+        return _prebuilt_response(*get_ip_management_css(), mimetype='text/css',
+                                  cache_control='private, max-age=31536000, immutable')
+
+    @app.route('/ip-management/ip_management.js')
+    @login_required
+    def ip_management_js():
+        """Serve the IP management script (URL is content-fingerprinted)"""
+        return _prebuilt_response(*get_ip_management_js(), mimetype='text/javascript',
+                                  cache_control='private, max-age=31536000, immutable')
 
     @app.route('/api/sessions', methods=['GET'])
     @login_required
     def get_sessions():
-        return jsonify(manager.get_active_sessions())
+        # Always revalidated; the ETag turns an unchanged list into an empty 304
+        return _cacheable_json(manager.get_active_sessions(), max_age=0)
+
+    # One poller thread watches MediaMTX while any page is subscribed to the
+    # session stream and hands each changed list to every subscriber
+    session_subscribers = set()
+    session_push_lock = threading.Lock()
+    session_push_state = {'payload': None, 'thread': None}
+
+    def session_poller():
+        try:
+            while True:
+                with session_push_lock:
+                    if not session_subscribers:
+                        session_push_state['payload'] = None
+                        session_push_state['thread'] = None
+                        return
+                try:
+                    payload = json.dumps(manager.get_active_sessions())
+                except Exception as e:
+                    # A failed poll (e.g. MediaMTX restarting) must not end the
+                    # stream for every subscriber; try again next interval
+                    print(f"  [Sessions] Failed to poll active sessions: {e}")
+                else:
+                    with session_push_lock:
+                        if payload != session_push_state['payload']:
+                            session_push_state['payload'] = payload
+                            for subscriber in session_subscribers:
+                                subscriber.put(payload)
+                time.sleep(SESSION_PUSH_INTERVAL)
+        finally:
+            # If this thread dies unexpectedly, let the next subscriber start a new one
+            with session_push_lock:
+                if session_push_state['thread'] is threading.current_thread():
+                    session_push_state['thread'] = None
+
+    @app.route('/api/sessions/stream')
+    @login_required
+    def stream_sessions():
+        """Server-sent events: the session list, sent again whenever it changes"""
+        subscriber = queue.Queue()
+        with session_push_lock:
+            session_subscribers.add(subscriber)
+            if session_push_state['payload'] is not None:
+                subscriber.put(session_push_state['payload'])
+            if session_push_state['thread'] is None:
+                session_push_state['thread'] = threading.Thread(target=session_poller, daemon=True)
+                session_push_state['thread'].start()
+
+        def generate():
+            try:
+                while True:
+                    try:
+                        payload = subscriber.get(timeout=SESSION_STREAM_PING_INTERVAL)
+                    except queue.Empty:
+                        # Keeps proxies from timing out an idle stream and
+                        # surfaces a closed connection
+                        yield ': ping\n\n'
+                        continue
+                    yield f'data: {payload}\n\n'
+            finally:
+                with session_push_lock:
+                    session_subscribers.discard(subscriber)
+
+        return Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    # Serializes every whitelist write (POST and PATCH) so concurrent edits
+    # from several pages can't drop each other
+    whitelist_lock = threading.Lock()
+
+    def invalid_whitelist_entries(entries):
+        """Return the entries that are not a valid IP address or CIDR range"""
+        invalid = []
+        for entry in entries:
+            try:
+                if not isinstance(entry, str):
+                    raise TypeError(entry)
+                ipaddress.ip_network(entry, strict=False)
+            except (TypeError, ValueError):
+                invalid.append(str(entry))
+        return invalid
+
+    def is_string_list(value):
+        return isinstance(value, list) and all(isinstance(entry, str) for entry in value)
 
     @app.route('/api/settings/whitelist', methods=['POST'])
     @login_required
     def save_whitelist():
-        data = request.json
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('whitelist', []), list):
+            return jsonify({'success': False, 'error': "Expected {'whitelist': [...]}"}), 400
         whitelist = data.get('whitelist', [])
+        invalid = invalid_whitelist_entries(whitelist)
+        if invalid:
+            return jsonify({'success': False, 'error': f"Invalid IP or CIDR: {', '.join(invalid)}"}), 400
         try:
-            manager.save_ip_whitelist(whitelist)
+            with whitelist_lock:
+                manager.save_ip_whitelist(whitelist)
             return jsonify({'success': True})
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
 
+    @app.route('/api/settings/whitelist', methods=['PATCH'])
+    @login_required
+    def update_whitelist():
+        """Apply {'add': [...], 'remove': [...]} to the whitelist in one write"""
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': "Expected {'add': [...], 'remove': [...]}"}), 400
+        add = data.get('add', [])
+        remove = data.get('remove', [])
+        if not is_string_list(add) or not is_string_list(remove):
+            return jsonify({'success': False, 'error': "'add' and 'remove' must be lists of strings"}), 400
+        remove = set(remove)
+        invalid = invalid_whitelist_entries(add)
+        if invalid:
+            return jsonify({'success': False, 'error': f"Invalid IP or CIDR: {', '.join(invalid)}"}), 400
+        try:
+            with whitelist_lock:
+                whitelist = [entry for entry in manager.get_ip_whitelist() if entry not in remove]
+                for entry in add:
+                    if entry not in whitelist:
+                        whitelist.append(entry)
+                manager.save_ip_whitelist(whitelist)
+            return jsonify({'success': True, 'whitelist': describe_whitelist(whitelist)})
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
     @app.route('/api/auth', methods=['POST'])
     def mediamtx_auth():
         """Handle authentication requests from MediaMTX"""